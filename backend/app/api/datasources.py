@@ -6,11 +6,19 @@ from backend.utils.crypto import encrypt
 from backend.config.settings import ENCRYPTION_KEY
 from backend.utils.azure_utils import test_adls_connection
 from fastapi.concurrency import run_in_threadpool
-from backend.utils.azure_utils import test_adls_connection
+from backend.utils.azure_utils import test_adls_connection, invalidate_azure_clients
+from backend.app.services.copy_manager import invalidate_azure_config
 
 
 router = APIRouter()
 
+def invalidate_cached_credentials(ds):
+    # Cached credentials and Azure clients must not outlive the data source they were built from
+    invalidate_azure_config(ds.get("id"))
+    config = ds.get("config")
+    if isinstance(config, dict) and config.get("account_name"):
+        invalidate_azure_clients(config["account_name"])
+
 @router.get("/datasources")
 def list_data_sources():
     return load_data_sources()
@@ -27,6 +35,7 @@ def add_data_source(ds: DataSource):
     # Dynamically assign the id
     data_sources.append(ds.dict())
     save_data_sources(data_sources)
+    invalidate_cached_credentials(ds.dict())
     return ds
 
 @router.delete("/datasources/{ds_id}")
@@ -36,6 +45,9 @@ def delete_data_source(ds_id: str = Path(..., description="The ID of the data so
     if len(new_sources) == len(data_sources):
         raise HTTPException(status_code=404, detail="Data source not found")
     save_data_sources(new_sources)
+    for ds in data_sources:
+        if str(ds.get("id")) == str(ds_id):
+            invalidate_cached_credentials(ds)
     return {"detail": "Deleted"}
 
 @router.put("/datasources/{ds_id}")
@@ -51,12 +63,14 @@ def update_data_source(ds_id: str, ds: DataSource):
             if ds.type == "Azure Data Lake Storage" and "account_key" in ds.config:                     
                 ds.config["account_key"] = encrypt(ds.config["account_key"], ENCRYPTION_KEY)
             ds.id = ds_id  # Ensure ID stays the same
+            invalidate_cached_credentials(existing)
             data_sources[idx] = ds.dict()
             found = True
             break
     if not found:
         raise HTTPException(status_code=404, detail="Data source not found")
     save_data_sources(data_sources)
+    invalidate_cached_credentials(ds.dict())
     return ds
 
 @router.post("/datasources/test")
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from backend.app.services.job_executor import executor
+
+router = APIRouter(prefix="/executor")
+
+@router.get("/metrics")
+def get_executor_metrics():
+    """
+    Job executor load: workers, runs in progress and waiting (by priority),
+    recent queue wait times and per data source concurrency.
+    """
+    return executor.metrics()
+
+@router.get("/queue")
+def get_executor_queue():
+    """
+    Runs waiting, in the order they will be considered, and runs in progress.
+    """
+    return executor.queue()
@@ -2,26 +2,23 @@ from datetime import datetime
 from fastapi import APIRouter, HTTPException, Request
 from backend.models.copy_job import CopyJob
 from backend.storage.job_details_storage import load_jobs, save_jobs
-from backend.storage.run_history_storage import load_run_history
+from backend.storage.run_history_storage import load_latest_runs, delete_latest_run
 
 router = APIRouter()
 
 @router.get("/jobs")
 def list_jobs():
     jobs = load_jobs()
+    latest_runs = load_latest_runs([job["id"] for job in jobs])
     for job in jobs:
-        run_history = load_run_history(job["id"])
-        if run_history:
-            latest_run = run_history[-1]
+        latest_run = latest_runs.get(job["id"])
+        if latest_run:
             job["latest_run_result"] = {
                 "status": latest_run.get("status"),
                 "message": latest_run.get("message"),
-                "copied_files_count": (
-                    sum(len(dr.get("copied_files", [])) for dr in latest_run.get("date_runs", []))
-                    if "date_runs" in latest_run
-                    else len(latest_run.get("copied_files", []))
-                ),
+                "copied_files_count": latest_run.get("copied_files_count", 0),
                 "timestamp": latest_run.get("timestamp"),
+                "duration_seconds": latest_run.get("duration_seconds"),
             }
         else:
             job["latest_run_result"] = None
@@ -67,4 +64,5 @@ def delete_job(job_id: str):
     if len(new_jobs) == len(jobs):
         raise HTTPException(status_code=404, detail="Job not found")
     save_jobs(new_jobs)
+    delete_latest_run(job_id)
     return {"detail": "Deleted"}
\ No newline at end of file
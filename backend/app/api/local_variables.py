@@ -1,12 +1,11 @@
 from fastapi import APIRouter, Body, HTTPException
-from backend.storage.job_details_storage import load_jobs, save_jobs
+from backend.storage.job_details_storage import load_jobs, save_jobs, load_job_by_id
 
 router = APIRouter()
 
 @router.get("/jobs/{job_id}/local-variables")
 def list_local_variables(job_id: str):
-    jobs = load_jobs()
-    job = next((j for j in jobs if str(j.get("id")) == str(job_id)), None)
+    job = load_job_by_id(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     return job.get("local_variables", [])
@@ -1,36 +1,83 @@
-import os
-import json
 import uuid
+import pytz
 from fastapi import APIRouter, HTTPException
-from filelock import FileLock
+from backend.config.settings import SCHEDULER_PREVIEW_MAX
+from backend.storage.schedule_storage import load_schedules, save_schedules, load_schedule_by_id
+from backend.app.services.scheduler_runner import scheduler, notify_schedules_changed, preview_fire_times
+from backend.utils.business_calendar import get_calendar, supported_calendars
 
 router = APIRouter()
-SCHEDULE_FILE = "backend/data/schedules.json"
-
-def load_schedules():
-    if not os.path.exists(SCHEDULE_FILE):
-        return []
-    with open(SCHEDULE_FILE, "r") as f:
-        return json.load(f)
-
-def save_schedules(schedules):
-    with FileLock(SCHEDULE_FILE + ".lock"):
-        with open(SCHEDULE_FILE, "w") as f:
-            json.dump(schedules, f, indent=2)
 
 @router.get("/schedules")
 def get_schedules():
     return load_schedules()
 
+def _check_calendar(schedule):
+    try:
+        get_calendar(schedule.get("calendar"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _fire_time(sch, fire_at):
+    tz = pytz.timezone(sch.get("timezone") or "UTC")
+    return {"utc": fire_at.isoformat(), "local": fire_at.astimezone(tz).isoformat()}
+
+def _preview(sch, count):
+    if not 1 <= count <= SCHEDULER_PREVIEW_MAX:
+        raise HTTPException(status_code=400, detail=f"count must be between 1 and {SCHEDULER_PREVIEW_MAX}.")
+    try:
+        fire_times = preview_fire_times(sch, count)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Invalid schedule: {e}")
+    return [_fire_time(sch, fire_at) for fire_at in fire_times]
+
+@router.get("/schedules/calendars")
+def get_calendars():
+    """
+    Holiday calendars a schedule's "calendar" may name: countries with their subdivisions, and markets.
+    """
+    return supported_calendars()
+
+@router.get("/schedules/upcoming")
+def get_upcoming_runs(count: int = 10):
+    """
+    The next runs across all active schedules, earliest first.
+    """
+    if not 1 <= count <= SCHEDULER_PREVIEW_MAX:
+        raise HTTPException(status_code=400, detail=f"count must be between 1 and {SCHEDULER_PREVIEW_MAX}.")
+    return [
+        {"schedule_id": sch.get("id"), "name": sch.get("name"), "jobId": sch.get("jobId"), **_fire_time(sch, fire_at)}
+        for sch, fire_at in scheduler.upcoming(count)
+    ]
+
+@router.get("/schedules/{schedule_id}/next-runs")
+def get_next_runs(schedule_id: str, count: int = 5):
+    """
+    The next `count` fire times of a schedule, in UTC and in its own timezone.
+    """
+    sch = load_schedule_by_id(schedule_id)
+    if sch is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return {"schedule_id": schedule_id, "paused": bool(sch.get("paused")), "fire_times": _preview(sch, count)}
+
+@router.post("/schedules/preview")
+def preview_schedule(schedule: dict, count: int = 5):
+    """
+    Fire times of a schedule that has not been saved, e.g. while it is being edited.
+    """
+    return {"fire_times": _preview(schedule, count)}
+
 @router.post("/schedules")
 def add_schedule(schedule: dict):
     schedules = load_schedules()
     if any(s.get("name", "").strip().lower() == schedule.get("name", "").strip().lower() for s in schedules):
         raise HTTPException(status_code=400, detail="A scheduler with this name already exists.")
+    _check_calendar(schedule)
     schedule["id"] = str(uuid.uuid4())
     schedule["paused"] = False  # <-- Add this line
     schedules.append(schedule)
     save_schedules(schedules)
+    notify_schedules_changed()
     return schedule
 
 @router.post("/schedules/{schedule_id}/pause")
@@ -45,6 +92,7 @@ def pause_schedule(schedule_id: str):
     if not found:
         raise HTTPException(status_code=404, detail="Schedule not found")
     save_schedules(schedules)
+    notify_schedules_changed()
     return {"detail": "Paused"}
 
 @router.post("/schedules/{schedule_id}/resume")
@@ -59,6 +107,7 @@ def resume_schedule(schedule_id: str):
     if not found:
         raise HTTPException(status_code=404, detail="Schedule not found")
     save_schedules(schedules)
+    notify_schedules_changed()
     return {"detail": "Resumed"}
 
 @router.put("/schedules/{schedule_id}")
@@ -73,6 +122,7 @@ def update_schedule(schedule_id: str, updated: dict):
                 for s in schedules
             ):
                 raise HTTPException(status_code=400, detail="A scheduler with this name already exists.")
+            _check_calendar(updated)
             updated["id"] = schedule_id
             schedules[idx] = updated
             found = True
@@ -80,6 +130,7 @@ def update_schedule(schedule_id: str, updated: dict):
     if not found:
         raise HTTPException(status_code=404, detail="Schedule not found")
     save_schedules(schedules)
+    notify_schedules_changed()
     return updated
 
 @router.delete("/schedules/{schedule_id}")
@@ -89,4 +140,5 @@ def delete_schedule(schedule_id: str):
     if len(new_schedules) == len(schedules):
         raise HTTPException(status_code=404, detail="Schedule not found")
     save_schedules(new_schedules)
+    notify_schedules_changed()
     return {"detail": "Deleted"}
\ No newline at end of file
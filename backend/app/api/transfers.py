@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from backend.app.services.transfer_governor import governor
+
+router = APIRouter(prefix="/transfers")
+
+@router.get("/governor")
+def get_governor_utilisation():
+    """
+    Current use of the transfer governor: memory held by chunks in flight,
+    per data source bandwidth limits and throughput, and the copies running.
+    """
+    return governor.utilisation()
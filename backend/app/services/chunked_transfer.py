@@ -0,0 +1,416 @@
+import os
+import hashlib
+import threading
+import concurrent.futures
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.filedatalake import ContentSettings
+from backend.config.settings import COPY_CHUNK_SIZE_MB
+from backend.app.services.transfer_governor import NO_LEASE
+
+# Readers and writers are safe to call from several threads at once: local files use
+# pread/pwrite where the platform has them (a lock around seek + read/write otherwise),
+# and ADLS ranges are independent requests.
+#
+# Writers can resume: begin(size, resume_offset) returns the offset to continue from,
+# checkpoint(offset) makes everything before offset durable, and abort(keep_partial)
+# leaves the partial target in place for the next attempt.
+#
+# Readers report the source's stored Content-MD5 (None when there is none), and
+# writers store the MD5 computed while streaming as the target's Content-MD5.
+
+# Local targets are written under this suffix and renamed once complete
+PART_SUFFIX = ".copypilot.part"
+
+
+class LocalFileReader:
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def size(self):
+        return os.path.getsize(self.path)
+
+    def read_range(self, offset, length):
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "rb")
+            if not hasattr(os, "pread"):
+                self._file.seek(offset)
+                return self._file.read(length)
+        return os.pread(self._file.fileno(), length, offset)
+
+    def content_md5(self):
+        return None
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+
+class AdlsFileReader:
+    def __init__(self, file_client, size=None):
+        self.file_client = file_client
+        self._size = size
+
+    def size(self):
+        if self._size is None:
+            self._size = self.file_client.get_file_properties().size
+        return self._size
+
+    def read_range(self, offset, length):
+        return self.file_client.download_file(offset=offset, length=length).readall()
+
+    def content_md5(self):
+        md5 = self.file_client.get_file_properties().content_settings.content_md5
+        return bytes(md5) if md5 else None
+
+    def close(self):
+        pass
+
+
+class LocalFileWriter:
+    def __init__(self, path):
+        self.path = path
+        self.part_path = path + PART_SUFFIX
+        self._file = None
+        self._lock = threading.Lock()
+
+    def begin(self, size, resume_offset=0):
+        # Data past the last checkpoint may contain holes from out-of-order writes, so it is cut off
+        if resume_offset and os.path.exists(self.part_path) and os.path.getsize(self.part_path) >= resume_offset:
+            self._file = open(self.part_path, "r+b")
+            self._file.truncate(resume_offset)
+            return resume_offset
+        self._file = open(self.part_path, "wb")
+        return 0
+
+    def write_range(self, offset, data):
+        if hasattr(os, "pwrite"):
+            view = memoryview(data)
+            while view:
+                written = os.pwrite(self._file.fileno(), view, offset)
+                view, offset = view[written:], offset + written
+            return
+        with self._lock:
+            self._file.seek(offset)
+            self._file.write(data)
+
+    def checkpoint(self, offset):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def commit(self, size, content_md5=None):
+        self._file.close()
+        self._file = None
+        os.replace(self.part_path, self.path)
+
+    def reader(self):
+        return LocalFileReader(self.path)
+
+    def abort(self, keep_partial=False):
+        if self._file:
+            self._file.close()
+            self._file = None
+        if not keep_partial and os.path.exists(self.part_path):
+            os.remove(self.part_path)
+
+
+class AdlsFileWriter:
+    # Appends may arrive in any order; ADLS assembles them by offset. Flushing commits
+    # a prefix of the file, so the committed size is where a resumed transfer continues.
+    def __init__(self, file_client):
+        self.file_client = file_client
+
+    def begin(self, size, resume_offset=0):
+        if resume_offset:
+            try:
+                committed = self.file_client.get_file_properties().size
+                if committed <= size:
+                    return committed
+            except ResourceNotFoundError:
+                pass
+        self.file_client.create_file()
+        return 0
+
+    def write_range(self, offset, data):
+        self.file_client.append_data(data, offset=offset, length=len(data))
+
+    def checkpoint(self, offset):
+        # Later ranges may already be appended; keep them for the final flush
+        self.file_client.flush_data(offset, retain_uncommitted_data=True)
+
+    def commit(self, size, content_md5=None):
+        if content_md5:
+            self.file_client.flush_data(size, content_settings=ContentSettings(content_md5=bytearray(content_md5)))
+        else:
+            self.file_client.flush_data(size)
+
+    def reader(self):
+        return AdlsFileReader(self.file_client)
+
+    def abort(self, keep_partial=False):
+        pass
+
+
+class TeeWriter:
+    """
+    Delivers one stream to several writers, so a source read once feeds every
+    target of a fan-out copy. Each call goes to all writers at the same time and
+    fails if any of them fails.
+    """
+    def __init__(self, writers):
+        self.writers = list(writers)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(self.writers))
+
+    def _each(self, call):
+        futures = [self._executor.submit(call, writer) for writer in self.writers]
+        return [future.result() for future in futures]
+
+    def begin(self, size, resume_offset=0):
+        try:
+            starts = self._each(lambda w: w.begin(size, resume_offset))
+            if len(set(starts)) == 1:
+                return starts[0]
+            # Targets stopped at different points; start them all over
+            for writer in self.writers:
+                writer.abort(keep_partial=True)
+            self._each(lambda w: w.begin(size, 0))
+            return 0
+        except Exception:
+            self.abort(keep_partial=True)
+            raise
+
+    def write_range(self, offset, data):
+        self._each(lambda w: w.write_range(offset, data))
+
+    def checkpoint(self, offset):
+        self._each(lambda w: w.checkpoint(offset))
+
+    def commit(self, size, content_md5=None):
+        try:
+            self._each(lambda w: w.commit(size, content_md5))
+        finally:
+            self._executor.shutdown()
+
+    def abort(self, keep_partial=False):
+        for writer in self.writers:
+            try:
+                writer.abort(keep_partial=keep_partial)
+            except Exception:
+                pass
+        self._executor.shutdown()
+
+
+class ChecksumMismatchError(IOError):
+    pass
+
+
+class StreamDigest:
+    """
+    MD5 of a transfer, fed with the data in offset order as it streams through,
+    so verifying a copy needs no extra pass over the file.
+    expected: the source's stored Content-MD5, checked before the target is committed
+    """
+    def __init__(self, expected=None):
+        self._md5 = hashlib.md5(usedforsecurity=False)
+        self.expected = expected
+
+    def update(self, data):
+        self._md5.update(data)
+
+    def read_from(self, reader, end, chunk_size):
+        # Hashes bytes [0, end) of reader; used for the prefix of a resumed copy
+        # and to re-read a target when a full verification is requested
+        for offset in range(0, end, chunk_size):
+            self.update(reader.read_range(offset, min(chunk_size, end - offset)))
+
+    def digest(self):
+        return self._md5.digest()
+
+    def hexdigest(self):
+        return self._md5.hexdigest()
+
+    def check(self, expected_from="source", actual_from="copied data"):
+        if self.expected and self.expected != self.digest():
+            raise ChecksumMismatchError(
+                f"MD5 mismatch: {expected_from} is {self.expected.hex()}, {actual_from} is {self.hexdigest()}."
+            )
+
+
+def _maybe_checkpoint(writer, progress, offset, last):
+    # Persists progress every progress.interval bytes; returns the last checkpointed offset
+    if progress and offset - last >= progress.interval:
+        writer.checkpoint(offset)
+        progress.record(offset)
+        return offset
+    return last
+
+
+def _copy_chunk(reader, writer, lease, offset, length):
+    # Holds the chunk against the memory budget and paces both sides of the copy
+    with lease.reserve(length):
+        lease.throttle("source", length)
+        data = reader.read_range(offset, length)
+        lease.throttle("target", len(data))
+        if data:
+            writer.write_range(offset, data)
+    return data
+
+
+def _hash_prefix(reader, digest, start, chunk_size):
+    # A resumed transfer never streamed its first start bytes in this attempt
+    if digest and start:
+        digest.read_from(reader, start, chunk_size)
+
+
+def _commit(writer, size, digest):
+    if digest:
+        digest.check()
+    writer.commit(size, digest.digest() if digest else None)
+
+
+def _abort(writer, progress, last_checkpoint, error):
+    # A partial target is kept for the next attempt unless its data proved wrong,
+    # in which case the next attempt starts over
+    if isinstance(error, ChecksumMismatchError):
+        if progress:
+            progress.record(0)
+        writer.abort(keep_partial=False)
+        return
+    writer.abort(keep_partial=bool(progress and last_checkpoint))
+
+
+def stream_file(reader, writer, chunk_size, progress=None, lease=NO_LEASE, digest=None):
+    """
+    Copies reader to writer in chunks of at most chunk_size bytes, so the
+    memory held by one transfer never exceeds a single chunk.
+    progress: optional FileProgress; the copy resumes from progress.offset and
+    checkpoints every progress.interval bytes.
+    lease: governor lease that paces the copy and accounts for its memory
+    digest: optional StreamDigest fed with every chunk
+    Returns the number of bytes copied.
+    """
+    size = reader.size()
+    offset = writer.begin(size, progress.offset if progress else 0)
+    last_checkpoint = offset
+    try:
+        _hash_prefix(reader, digest, offset, chunk_size)
+        while offset < size:
+            data = _copy_chunk(reader, writer, lease, offset, min(chunk_size, size - offset))
+            if not data:
+                raise IOError(f"Unexpected end of source at byte {offset} of {size}.")
+            if digest:
+                digest.update(data)
+            offset += len(data)
+            last_checkpoint = _maybe_checkpoint(writer, progress, offset, last_checkpoint)
+        _commit(writer, size, digest)
+    except Exception as e:
+        _abort(writer, progress, last_checkpoint, e)
+        raise
+    finally:
+        reader.close()
+    return size
+
+
+def parallel_stream_file(reader, writer, chunk_size, concurrency, progress=None, lease=NO_LEASE, digest=None):
+    """
+    Copies reader to writer as ranges of chunk_size bytes, with up to
+    concurrency ranges read and written at the same time (ranged GETs for ADLS
+    sources, parallel appends plus one flush for ADLS targets, pread/pwrite for
+    local files). Peak memory is about concurrency * chunk_size.
+    Ranges are collected in order, so checkpoints only ever cover a complete
+    prefix and the digest sees the data in file order.
+    Returns the number of bytes copied.
+    """
+    size = reader.size()
+    start = writer.begin(size, progress.offset if progress else 0)
+    last_checkpoint = start
+
+    def copy_range(offset):
+        length = min(chunk_size, size - offset)
+        data = _copy_chunk(reader, writer, lease, offset, length)
+        if len(data) != length:
+            raise IOError(f"Short read at byte {offset}: expected {length} bytes, got {len(data)}.")
+        return offset + length, data if digest else None
+
+    def collect(future):
+        done_to, data = future.result()
+        if digest:
+            digest.update(data)
+        return _maybe_checkpoint(writer, progress, done_to, last_checkpoint)
+
+    try:
+        _hash_prefix(reader, digest, start, chunk_size)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as executor:
+            in_flight = []
+            for offset in range(start, size, chunk_size):
+                if len(in_flight) >= concurrency:
+                    last_checkpoint = collect(in_flight.pop(0))
+                in_flight.append(executor.submit(copy_range, offset))
+            for future in in_flight:
+                last_checkpoint = collect(future)
+        _commit(writer, size, digest)
+    except Exception as e:
+        _abort(writer, progress, last_checkpoint, e)
+        raise
+    finally:
+        reader.close()
+    return size
+
+
+def verify_copy(source_reader, target_reader, chunk_size):
+    """
+    Hashes a source and its copy and raises ChecksumMismatchError if they differ.
+    Used for copies whose data never passes through this process.
+    Returns the MD5 as hex.
+    """
+    source, target = StreamDigest(), StreamDigest()
+    try:
+        source.read_from(source_reader, source_reader.size(), chunk_size)
+        target.expected = source.digest()
+        target.read_from(target_reader, target_reader.size(), chunk_size)
+    finally:
+        source_reader.close()
+        target_reader.close()
+    target.check("source", "target")
+    return target.hexdigest()
+
+
+def transfer_file(reader, writer, options, progress=None):
+    """
+    Copies one file, choosing the engine by size: files of at least the large-file
+    threshold are split into ranges copied concurrently, smaller ones are streamed.
+    options: transfer options built by get_transfer_options
+    progress: optional FileProgress used to resume and checkpoint the transfer
+    Unless options["verify"] is "off", the MD5 of the data is computed on the way
+    through and stored as the target's. "metadata" also checks it against the
+    source's Content-MD5 when it has one (one more request for ADLS sources), and
+    "reread" against a hash of the target once it is written.
+    Returns the MD5 as hex, or None when verification is off.
+    """
+    lease = options.get("lease") or NO_LEASE
+    verify = options.get("verify", "store")
+    digest = StreamDigest(reader.content_md5() if verify == "metadata" else None) if verify != "off" else None
+    chunk_size = options.get("chunk_size") or COPY_CHUNK_SIZE_MB * 1024 * 1024
+    large_file = options.get("large_file") or {}
+    threshold = large_file.get("threshold")
+    size = reader.size()
+    if threshold is not None and size >= threshold and large_file.get("concurrency", 1) > 1:
+        chunk_size = large_file["chunk_size"]
+        parallel_stream_file(reader, writer, chunk_size, large_file["concurrency"], progress, lease, digest)
+    else:
+        stream_file(reader, writer, chunk_size, progress, lease, digest)
+    if not digest:
+        return None
+    if verify == "reread":
+        for target_writer in getattr(writer, "writers", [writer]):
+            target = StreamDigest(digest.digest())
+            target_reader = target_writer.reader()
+            try:
+                target.read_from(target_reader, size, chunk_size)
+            finally:
+                target_reader.close()
+            target.check("copied data", "target")
+    return digest.hexdigest()
@@ -1,52 +1,179 @@
 import os
 import fnmatch
-import shutil
+import threading
 from azure.core.exceptions import AzureError
 from backend.utils.azure_utils import get_adl_service_client
 from backend.utils.crypto import decrypt
-from backend.config.settings import ENCRYPTION_KEY
+from backend.utils.fast_copy import fast_copy_file, move_file
+from backend.utils.file_walker import walk_files
+from backend.config.settings import (
+    ENCRYPTION_KEY, COPY_CHUNK_SIZE_MB,
+    LARGE_FILE_THRESHOLD_MB, LARGE_FILE_CHUNK_SIZE_MB, LARGE_FILE_CONCURRENCY
+)
 from backend.storage.data_source_storage import load_data_source_by_id
+from backend.app.services.transfer_pool import (
+    PartialCopyError, resolve_max_workers, run_transfers, raise_for_failures, prefetch
+)
+from backend.app.services.server_side_copy import copy_blobs
+from backend.app.services.transfer_manifest import TransferManifest, local_fingerprint, adls_fingerprint
+from backend.app.services.transfer_checkpoint import TransferCheckpoint, run_key_for
+from backend.app.services.transfer_governor import governor
+from backend.app.services.chunked_transfer import (
+    LocalFileReader, AdlsFileReader, LocalFileWriter, AdlsFileWriter, TeeWriter, transfer_file, verify_copy
+)
+
+# "auto" and "server" use server-side copy for Azure to Azure jobs, "stream" routes data through this host
+COPY_MODES = ("auto", "server", "stream")
+# "metadata" checks streamed data against the source's Content-MD5, "reread" also re-reads the target
+VERIFY_MODES = ("off", "store", "metadata", "reread")
+# Used when a copy function is called without a manifest or checkpoint: nothing is skipped, resumed or recorded
+NO_MANIFEST = TransferManifest(None, enabled=False)
+NO_CHECKPOINT = TransferCheckpoint(None, None, enabled=False)
+
+# Decrypted Azure configs keyed by data source id, so runs do no file I/O or crypto
+# for credentials already resolved. The data source endpoints invalidate entries on change.
+_azure_config_cache = {}
+_azure_config_cache_lock = threading.Lock()
+_totals_lock = threading.Lock()
 
 def get_azure_config_by_id(azure_id):
+    with _azure_config_cache_lock:
+        cached = _azure_config_cache.get(str(azure_id))
+    if cached:
+        return dict(cached)
     ds = load_data_source_by_id(azure_id)
     if not ds:
         raise ValueError(f"Azure Data Source with id {azure_id} not found")
-    config = ds["config"]
+    config = dict(ds["config"])
     config["account_key"] = decrypt(config["account_key"], ENCRYPTION_KEY)
-    return config
+    with _azure_config_cache_lock:
+        _azure_config_cache[str(azure_id)] = config
+    return dict(config)
+
+def invalidate_azure_config(azure_id=None):
+    """
+    Drops the cached credentials of a data source, or of all data sources if azure_id is None.
+    """
+    with _azure_config_cache_lock:
+        if azure_id is None:
+            _azure_config_cache.clear()
+        else:
+            _azure_config_cache.pop(str(azure_id), None)
+
+def deliver(options, source_key, target_key, fingerprint, copy, target_exists=True):
+    """
+    Delivers one file. It is skipped if an incremental copy already delivered it
+    unchanged, reused if an earlier attempt of this run completed it, and otherwise
+    copied with copy(progress), resuming a partial transfer where possible.
+    Returns the copied target, or None if the file was skipped.
+    """
+    manifest = options.get("manifest") or NO_MANIFEST
+    checkpoint = options.get("checkpoint") or NO_CHECKPOINT
+    result = manifest.transfer(
+        source_key, target_key, fingerprint,
+        lambda: checkpoint.run(source_key, target_key, fingerprint, copy, retries=options.get("retries", 0)),
+        target_exists=target_exists
+    )
+    if result is not None:
+        record_bytes(options, fingerprint.get("size"))
+    return result
+
+def record_checksum(options, target, md5):
+    # Collects the MD5 of each delivered file for the run record
+    checksums = options.get("checksums")
+    if checksums is not None and md5:
+        checksums[target] = md5
+
+def record_bytes(options, nbytes):
+    # Totals the size of the delivered source files for the run record
+    totals = options.get("totals")
+    if totals is not None and nbytes:
+        with _totals_lock:
+            totals["bytes_copied"] += nbytes
+
+def copy_or_move_local(src_file, dst_file, options):
+    # Kernel-side copy (reflink/copy_file_range/sendfile), or a rename when moving on one filesystem.
+    # The data never passes through this process, so it is only hashed when a re-read is requested.
+    if options.get("operation") == "move":
+        move_file(src_file, dst_file)
+    else:
+        fast_copy_file(src_file, dst_file)
+        if options.get("verify") == "reread":
+            md5 = verify_copy(LocalFileReader(src_file), LocalFileReader(dst_file), options.get("chunk_size"))
+            record_checksum(options, dst_file, md5)
+    return dst_file
+
+def iter_local_sources(source, file_mask, options, source_files):
+    """
+    Lazily walks a local or shared source folder and appends every file it yields
+    to source_files, so the copy can start before the whole folder is listed.
+    """
+    for walked in walk_files(
+        source, file_mask,
+        recursive=options.get("recursive", False),
+        max_depth=options.get("max_depth"),
+        exclude_dirs=options.get("exclude_dirs"),
+    ):
+        source_files.append(walked.path)
+        yield walked
 
-def copy_local_to_local(source, target, file_mask, _=None):
+def iter_adls_sources(dir_client, file_mask, source_files):
+    """
+    Lazily lists an Azure Data Lake directory page by page, yielding the path
+    properties of matching files and appending their names to source_files.
+    """
+    for path in dir_client.get_paths():
+        if not path.is_directory and fnmatch.fnmatch(os.path.basename(path.name), file_mask):
+            source_files.append(path.name)
+            yield path
+
+def local_target_path(target, walked):
+    # Files found in subdirectories keep their relative location under the target folder
+    dst_file = os.path.join(target, walked.relative_path)
+    if os.path.dirname(walked.relative_path):
+        os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+    return dst_file
+
+def copy_local_to_local(source, target, file_mask, _=None, options=None):
+    options = options or {}
     try:
         if not os.path.exists(source):
             raise FileNotFoundError(f"Source folder '{source}' does not exist.")
         if not os.path.exists(target):
             os.makedirs(target)
-        all_files = [f for f in os.listdir(source) if os.path.isfile(os.path.join(source, f))]
-        source_files = [os.path.join(source, f) for f in fnmatch.filter(all_files, file_mask)]
+        source_files = []
+
+        def copy_one(walked):
+            dst_file = local_target_path(target, walked)
+            return deliver(
+                options, walked.path, dst_file, local_fingerprint(walked.entry),
+                lambda progress: copy_or_move_local(walked.path, dst_file, options),
+                target_exists=os.path.exists(dst_file)
+            )
+
+        copied_files, failures = run_transfers(
+            prefetch(iter_local_sources(source, file_mask, options, source_files)), copy_one,
+            options.get("max_workers", 1), describe=lambda walked: walked.path
+        )
         if not source_files:
             raise Exception(f"No files matching '{file_mask}' found in folder '{source}'.")
-        copied_files = []
-        for src_file in source_files:
-            filename = os.path.basename(src_file)
-            dst_file = os.path.join(target, filename)
-            if not os.path.exists(src_file):
-                raise FileNotFoundError(f"File '{src_file}' does not exist in source folder '{source}'.")
-            shutil.copy2(src_file, dst_file)
-            copied_files.append(dst_file)
+        raise_for_failures(copied_files, source_files, failures)
         return copied_files, source_files
-    except FileNotFoundError as fnf:
-        raise FileNotFoundError(str(fnf))
+    except (FileNotFoundError, PartialCopyError):
+        raise
     except Exception as e:
         raise Exception(str(e))
 
-def copy_local_to_azure(source, target, file_mask, azure_config):
+def copy_local_to_azure(source, target, file_mask, azure_config, options=None):
     """
     Uploads files from a local folder to Azure Data Lake Storage.
     source: local folder path
     target: dict with keys 'filesystem' and 'directory'
     file_mask: e.g. '*.csv'
     azure_config: dict with 'account_name' and 'account_key'
+    options: transfer options built by get_transfer_options
     """
+    options = options or {}
     try:
         account_name = azure_config["account_name"]
         account_key = azure_config["account_key"]
@@ -61,30 +188,38 @@ def copy_local_to_azure(source, target, file_mask, azure_config):
         # List local files matching the mask
         if not os.path.exists(source):
             raise FileNotFoundError(f"Source folder '{source}' does not exist.")
-        all_files = [f for f in os.listdir(source) if os.path.isfile(os.path.join(source, f))]
-        source_files = [os.path.join(source, f) for f in fnmatch.filter(all_files, file_mask)]
+        source_files = []
+
+        def copy_one(walked):
+            relative_path = walked.relative_path.replace(os.sep, "/")
+            azure_path = f"{directory}/{relative_path}" if directory else relative_path
+            target_url = f"https://{account_name}.blob.core.windows.net/{filesystem}/{azure_path}"
+
+            def upload(progress):
+                file_client = file_system_client.get_file_client(azure_path)
+                md5 = transfer_file(LocalFileReader(walked.path), AdlsFileWriter(file_client), options, progress)
+                record_checksum(options, target_url, md5)
+                return target_url
+
+            return deliver(options, walked.path, target_url, local_fingerprint(walked.entry), upload)
+
+        copied_files, failures = run_transfers(
+            prefetch(iter_local_sources(source, file_mask, options, source_files)), copy_one,
+            options.get("max_workers", 1), describe=lambda walked: walked.path
+        )
         if not source_files:
             raise Exception(f"No files matching '{file_mask}' found in folder '{source}'.")
-        copied_files = []
-        for src_file in source_files:
-            filename = os.path.basename(src_file)
-            azure_path = f"{directory}/{filename}" if directory else filename
-            if not os.path.exists(src_file):
-                raise FileNotFoundError(f"File '{src_file}' does not exist in source folder '{source}'.")
-            file_client = file_system_client.get_file_client(azure_path)
-            with open(src_file, "rb") as data:
-                file_client.upload_data(data, overwrite=True)
-            copied_files.append(f"https://{account_name}.blob.core.windows.net/{filesystem}/{azure_path}")
-
+        raise_for_failures(copied_files, source_files, failures)
         return copied_files, source_files
-    except FileNotFoundError as fnf:
-        raise FileNotFoundError(str(fnf))
+    except (FileNotFoundError, PartialCopyError):
+        raise
     except AzureError as ae:
         raise Exception(f"Local to Azure copy failed (AzureError): {ae}")
     except Exception as e:
         raise Exception(str(e))
 
-def copy_azure_to_local(source, target, file_mask, azure_config):
+def copy_azure_to_local(source, target, file_mask, azure_config, options=None):
+    options = options or {}
     try:
         account_name = azure_config["account_name"]
         account_key = azure_config["account_key"]
@@ -93,41 +228,53 @@ def copy_azure_to_local(source, target, file_mask, azure_config):
         service_client = get_adl_service_client(account_name, account_key)
         file_system_client = service_client.get_file_system_client(filesystem)
         dir_client = file_system_client.get_directory_client(directory)
-        paths = dir_client.get_paths()
-        source_files = []
-        for path in paths:
-            if not path.is_directory:
-                filename = os.path.basename(path.name)
-                if fnmatch.fnmatch(filename, file_mask):
-                    source_files.append(path.name)
         if not os.path.exists(target):
             os.makedirs(target)
+        source_files = []
+
+        def copy_one(props):
+            file_path = props.name
+            local_filename = os.path.join(target, os.path.basename(file_path))
+            source_url = f"https://{account_name}.blob.core.windows.net/{filesystem}/{file_path}"
+
+            def download(progress):
+                file_client = file_system_client.get_file_client(file_path)
+                reader = AdlsFileReader(file_client, props.content_length)
+                md5 = transfer_file(reader, LocalFileWriter(local_filename), options, progress)
+                record_checksum(options, local_filename, md5)
+                return local_filename
+
+            return deliver(
+                options, source_url, local_filename, adls_fingerprint(props), download,
+                target_exists=os.path.exists(local_filename)
+            )
+
+        # Listing pages stream into the transfer workers instead of being collected first
+        copied_files, failures = run_transfers(
+            prefetch(iter_adls_sources(dir_client, file_mask, source_files)), copy_one,
+            options.get("max_workers", 1), describe=lambda props: props.name
+        )
         if not source_files:
             raise Exception(f"No files matching '{file_mask}' found in Azure directory '{directory}'.")
-        copied_files = []
-        for file_path in source_files:
-            file_client = file_system_client.get_file_client(file_path)
-            download = file_client.download_file()
-            file_content = download.readall()
-            local_filename = os.path.join(target, os.path.basename(file_path))
-            with open(local_filename, "wb") as f:
-                f.write(file_content)
-            copied_files.append(local_filename)
-        return copied_files, [f"https://{account_name}.blob.core.windows.net/{filesystem}/{f}" for f in source_files]
-    except FileNotFoundError as fnf:
-        raise FileNotFoundError(str(fnf))
+        source_urls = [f"https://{account_name}.blob.core.windows.net/{filesystem}/{f}" for f in source_files]
+        raise_for_failures(copied_files, source_urls, failures)
+        return copied_files, source_urls
+    except (FileNotFoundError, PartialCopyError):
+        raise
     except AzureError as ae:
         raise Exception(f"Azure to Local copy failed (AzureError): {ae}")
     except Exception as e:
         raise Exception(str(e))
 
-def copy_azure_to_azure(source, target, file_mask, configs):
+def copy_azure_to_azure(source, target, file_mask, configs, options=None):
     """
     Copy files from Azure Data Lake (possibly different accounts) to Azure Data Lake.
     source: dict with 'filesystem', 'directory', 'account_name', 'account_key' (optional)
     target: dict with 'filesystem', 'directory', 'account_name', 'account_key' (optional)
     configs: dict with 'source_azure' and 'target_azure' configs (each with account_name/key)
+    options: transfer options built by get_transfer_options
     """
+    options = options or {}
     try:
         # Use configs if provided, else fall back to source/target dicts
         src_account_name = configs.get("source_azure", {}).get("account_name") or source.get("account_name")
@@ -149,72 +296,260 @@ def copy_azure_to_azure(source, target, file_mask, configs):
         tgt_service_client = get_adl_service_client(tgt_account_name, tgt_account_key)
         tgt_fs_client = tgt_service_client.get_file_system_client(tgt_filesystem)
 
-        # List source files
-        paths = src_dir_client.get_paths()
         source_files = []
-        for path in paths:
-            if not path.is_directory:
-                filename = os.path.basename(path.name)
-                if fnmatch.fnmatch(filename, file_mask):
-                    source_files.append(path.name)
-        if not source_files:
-            raise Exception(f"No files matching '{file_mask}' found in Azure directory '{src_directory}'.")
-        copied_files = []
-        for file_path in source_files:
-            src_file_client = src_fs_client.get_file_client(file_path)
-            download = src_file_client.download_file()
-            file_content = download.readall()
+
+        def copy_one(props):
+            file_path = props.name
             filename = os.path.basename(file_path)
             tgt_path = f"{tgt_directory}/{filename}" if tgt_directory else filename
-            tgt_file_client = tgt_fs_client.get_file_client(tgt_path)
-            tgt_file_client.upload_data(file_content, overwrite=True)
-            copied_files.append(f"https://{tgt_account_name}.blob.core.windows.net/{tgt_filesystem}/{tgt_path}")
+            source_url = f"https://{src_account_name}.blob.core.windows.net/{src_filesystem}/{file_path}"
+            target_url = f"https://{tgt_account_name}.blob.core.windows.net/{tgt_filesystem}/{tgt_path}"
+
+            def copy(progress):
+                src_file_client = src_fs_client.get_file_client(file_path)
+                tgt_file_client = tgt_fs_client.get_file_client(tgt_path)
+                reader = AdlsFileReader(src_file_client, props.content_length)
+                md5 = transfer_file(reader, AdlsFileWriter(tgt_file_client), options, progress)
+                record_checksum(options, target_url, md5)
+                return target_url
+
+            return deliver(options, source_url, target_url, adls_fingerprint(props), copy)
 
-        return copied_files, [f"https://{src_account_name}.blob.core.windows.net/{src_filesystem}/{f}" for f in source_files]
+        # Listing pages stream into the transfer workers instead of being collected first
+        copied_files, failures = run_transfers(
+            prefetch(iter_adls_sources(src_dir_client, file_mask, source_files)), copy_one,
+            options.get("max_workers", 1), describe=lambda props: props.name
+        )
+        if not source_files:
+            raise Exception(f"No files matching '{file_mask}' found in Azure directory '{src_directory}'.")
+        source_urls = [f"https://{src_account_name}.blob.core.windows.net/{src_filesystem}/{f}" for f in source_files]
+        raise_for_failures(copied_files, source_urls, failures)
+        return copied_files, source_urls
+    except PartialCopyError:
+        raise
     except AzureError as ae:
         raise Exception(f"Azure to Azure copy failed (AzureError): {ae}")
     except Exception as e:
         raise Exception(str(e))
-    
-def copy_smb_to_smb(source, target, file_mask, smb_config=None):
+
+def copy_azure_to_azure_server_side(source, target, file_mask, configs, options=None):
+    """
+    Copy files from Azure Data Lake to Azure Data Lake using server-side copy.
+    The storage service moves the bytes itself, so no data flows through this host.
+    Arguments are the same as copy_azure_to_azure.
+    """
+    options = options or {}
+    manifest = options.get("manifest") or NO_MANIFEST
+    try:
+        src_config = configs.get("source_azure") or source
+        tgt_config = configs.get("target_azure") or target
+        src_account_name = src_config.get("account_name")
+        tgt_account_name = tgt_config.get("account_name")
+
+        src_filesystem = source.get("filesystem")
+        src_directory = source.get("directory", "")
+        tgt_filesystem = target.get("filesystem")
+        tgt_directory = target.get("directory", "")
+
+        src_service_client = get_adl_service_client(src_account_name, src_config.get("account_key"))
+        src_dir_client = src_service_client.get_file_system_client(src_filesystem).get_directory_client(src_directory)
+
+        source_files = []
+        source_props = {}
+
+        def source_url(file_path):
+            return f"https://{src_account_name}.blob.core.windows.net/{src_filesystem}/{file_path}"
+
+        def target_url(tgt_path):
+            return f"https://{tgt_account_name}.blob.core.windows.net/{tgt_filesystem}/{tgt_path}"
+
+        def iter_pairs():
+            # Copies are started while later listing pages are still being fetched
+            for props in prefetch(iter_adls_sources(src_dir_client, file_mask, source_files)):
+                source_props[props.name] = props
+                filename = os.path.basename(props.name)
+                tgt_path = f"{tgt_directory}/{filename}" if tgt_directory else filename
+                if manifest.is_unchanged(source_url(props.name), target_url(tgt_path), adls_fingerprint(props)):
+                    manifest.skip(source_url(props.name))
+                else:
+                    yield props.name, tgt_path
+
+        copied_pairs, failures = copy_blobs(
+            src_config, tgt_config, src_filesystem, tgt_filesystem, iter_pairs(), options.get("max_workers", 1)
+        )
+        if not source_files:
+            raise Exception(f"No files matching '{file_mask}' found in Azure directory '{src_directory}'.")
+        for file_path, tgt_path in copied_pairs:
+            manifest.record(source_url(file_path), target_url(tgt_path), adls_fingerprint(source_props[file_path]))
+            record_bytes(options, source_props[file_path].content_length)
+        copied_paths = [tgt_path for _, tgt_path in copied_pairs]
+
+        copied_files = [target_url(p) for p in copied_paths]
+        source_urls = [source_url(f) for f in source_files]
+        raise_for_failures(copied_files, source_urls, failures)
+        return copied_files, source_urls
+    except PartialCopyError:
+        raise
+    except AzureError as ae:
+        raise Exception(f"Azure to Azure server-side copy failed (AzureError): {ae}")
+    except Exception as e:
+        raise Exception(str(e))
+
+def copy_smb_to_smb(source, target, file_mask, smb_config=None, options=None):
+    options = options or {}
     try:
         if not os.path.exists(source):
             raise FileNotFoundError(f"Source SMB folder '{source}' does not exist.")
         if not os.path.exists(target):
             os.makedirs(target)
-        all_files = [f for f in os.listdir(source) if os.path.isfile(os.path.join(source, f))]
-        source_files = [os.path.join(source, f) for f in fnmatch.filter(all_files, file_mask)]
+        source_files = []
+
+        def copy_one(walked):
+            dst_file = local_target_path(target, walked)
+            return deliver(
+                options, walked.path, dst_file, local_fingerprint(walked.entry),
+                lambda progress: copy_or_move_local(walked.path, dst_file, options),
+                target_exists=os.path.exists(dst_file)
+            )
+
+        copied_files, failures = run_transfers(
+            prefetch(iter_local_sources(source, file_mask, options, source_files)), copy_one,
+            options.get("max_workers", 1), describe=lambda walked: walked.path
+        )
         if not source_files:
             raise Exception(f"No files matching '{file_mask}' found in SMB folder '{source}'.")
-        copied_files = []
-        for src_file in source_files:
-            filename = os.path.basename(src_file)
-            dst_file = os.path.join(target, filename)
-            if not os.path.exists(src_file):
-                raise FileNotFoundError(f"File '{src_file}' does not exist in source SMB folder '{source}'.")
-            shutil.copy2(src_file, dst_file)
-            copied_files.append(dst_file)
+        raise_for_failures(copied_files, source_files, failures)
         return copied_files, source_files
-    except FileNotFoundError as fnf:
-        raise FileNotFoundError(str(fnf))
+    except (FileNotFoundError, PartialCopyError):
+        raise
     except Exception as e:
         raise Exception(str(e))
 
-def copy_local_to_smb(source, target, file_mask, smb_config=None):
+def copy_local_to_smb(source, target, file_mask, smb_config=None, options=None):
     # Same as local to local, just target is a share path
-    return copy_local_to_local(source, target, file_mask)
+    return copy_local_to_local(source, target, file_mask, options=options)
 
-def copy_smb_to_local(source, target, file_mask, smb_config=None):
+def copy_smb_to_local(source, target, file_mask, smb_config=None, options=None):
     # Same as local to local, just source is a share path
-    return copy_local_to_local(source, target, file_mask)
+    return copy_local_to_local(source, target, file_mask, options=options)
 
-def copy_smb_to_azure(source, target, file_mask, azure_config):
+def copy_smb_to_azure(source, target, file_mask, azure_config, options=None):
     # Same as local to azure, just source is a share path
-    return copy_local_to_azure(source, target, file_mask, azure_config)
+    return copy_local_to_azure(source, target, file_mask, azure_config, options=options)
 
-def copy_azure_to_smb(source, target, file_mask, azure_config):
+def copy_azure_to_smb(source, target, file_mask, azure_config, options=None):
     # Same as azure to local, just target is a share path
-    return copy_azure_to_local(source, target, file_mask, azure_config)
+    return copy_azure_to_local(source, target, file_mask, azure_config, options=options)
+
+def fan_out_target(target):
+    """
+    Prepares one target of a fan-out copy. Returns a function mapping a file's path
+    relative to the source folder to (target_key, writer factory, target_exists).
+    """
+    if target["type"] == "azure":
+        account_name = target["config"]["account_name"]
+        filesystem = target["location"].get("filesystem")
+        directory = target["location"].get("directory", "")
+        service_client = get_adl_service_client(account_name, target["config"]["account_key"])
+        file_system_client = service_client.get_file_system_client(filesystem)
+
+        def resolve_azure(relative_path):
+            relative_path = relative_path.replace(os.sep, "/")
+            azure_path = f"{directory}/{relative_path}" if directory else relative_path
+            target_url = f"https://{account_name}.blob.core.windows.net/{filesystem}/{azure_path}"
+            return target_url, lambda: AdlsFileWriter(file_system_client.get_file_client(azure_path)), True
+
+        return resolve_azure
+
+    folder = target["location"]
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+
+    def resolve_local(relative_path):
+        dst_file = os.path.join(folder, relative_path)
+
+        def writer():
+            os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+            return LocalFileWriter(dst_file)
+
+        return dst_file, writer, os.path.exists(dst_file)
+
+    return resolve_local
+
+def copy_fan_out(source, targets, file_mask, source_config=None, options=None):
+    """
+    Copies every source file to several targets, reading it once and streaming
+    it to all of them at the same time.
+    source: local or shared folder path, or dict with 'filesystem' and 'directory' for Azure
+    targets: list of dicts with 'type', 'location' (folder path, or dict with 'filesystem'
+             and 'directory' for Azure) and 'config' (credentials of Azure targets)
+    source_config: dict with 'account_name' and 'account_key' when the source is Azure
+    options: transfer options built by get_transfer_options
+    Returns (copied_files, source_files); copied_files lists the copy at every target.
+    """
+    options = options or {}
+    try:
+        resolvers = [fan_out_target(target) for target in targets]
+        source_files = []
+
+        if source_config:
+            account_name = source_config["account_name"]
+            filesystem = source.get("filesystem")
+            location = source.get("directory", "")
+            service_client = get_adl_service_client(account_name, source_config["account_key"])
+            file_system_client = service_client.get_file_system_client(filesystem)
+            source_url = lambda name: f"https://{account_name}.blob.core.windows.net/{filesystem}/{name}"
+            items = iter_adls_sources(file_system_client.get_directory_client(location), file_mask, source_files)
+            describe = lambda props: props.name
+
+            def open_source(props):
+                # Azure sources are listed flat, so files land directly in each target folder
+                reader = lambda: AdlsFileReader(file_system_client.get_file_client(props.name), props.content_length)
+                return source_url(props.name), os.path.basename(props.name), adls_fingerprint(props), reader
+        else:
+            location = source
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"Source folder '{source}' does not exist.")
+            items = iter_local_sources(source, file_mask, options, source_files)
+            describe = lambda walked: walked.path
+
+            def open_source(walked):
+                reader = lambda: LocalFileReader(walked.path)
+                return walked.path, walked.relative_path, local_fingerprint(walked.entry), reader
+
+        def copy_one(item):
+            source_key, relative_path, fingerprint, open_reader = open_source(item)
+            resolved = [resolve(relative_path) for resolve in resolvers]
+            target_keys = [target_key for target_key, _, _ in resolved]
+
+            def copy(progress):
+                writer = TeeWriter([make_writer() for _, make_writer, _ in resolved])
+                md5 = transfer_file(open_reader(), writer, options, progress)
+                for target_key in target_keys:
+                    record_checksum(options, target_key, md5)
+                return target_keys
+
+            return deliver(
+                options, source_key, target_keys, fingerprint, copy,
+                target_exists=all(exists for _, _, exists in resolved)
+            )
+
+        delivered, failures = run_transfers(
+            prefetch(items), copy_one, options.get("max_workers", 1), describe=describe
+        )
+        if not source_files:
+            raise Exception(f"No files matching '{file_mask}' found in '{location}'.")
+        copied_files = [target_key for target_keys in delivered for target_key in target_keys]
+        if source_config:
+            source_files = [source_url(f) for f in source_files]
+        raise_for_failures(copied_files, source_files, failures)
+        return copied_files, source_files
+    except (FileNotFoundError, PartialCopyError):
+        raise
+    except AzureError as ae:
+        raise Exception(f"Fan-out copy failed (AzureError): {ae}")
+    except Exception as e:
+        raise Exception(str(e))
 
 COPY_FUNCTIONS = {
     ("local", "local"): copy_local_to_local,
@@ -228,13 +563,78 @@ COPY_FUNCTIONS = {
     ("shared", "shared"): copy_smb_to_smb,
 }
 
-def dispatch_copy(job):
+def get_transfer_options(job):
+    """
+    Builds the options passed to the copy functions from the job's transfer settings.
+    """
+    transfer = job.get("transfer") or {}
+    chunk_size_mb = transfer.get("chunk_size_mb") or COPY_CHUNK_SIZE_MB
+    copy_mode = transfer.get("copy_mode") or "auto"
+    if copy_mode not in COPY_MODES:
+        raise ValueError(f"Unknown copy mode '{copy_mode}'. Expected one of: {', '.join(COPY_MODES)}")
+    operation = transfer.get("operation") or "copy"
+    if operation not in ("copy", "move"):
+        raise ValueError(f"Unknown operation '{operation}'. Expected 'copy' or 'move'.")
+    if operation == "move" and "azure" in (job.get("sourceType"), job.get("targetType")):
+        raise NotImplementedError("Move is only supported between local and shared folders")
+    verify = transfer.get("verify") or "store"
+    if verify not in VERIFY_MODES:
+        raise ValueError(f"Unknown verify mode '{verify}'. Expected one of: {', '.join(VERIFY_MODES)}")
+    return {
+        "max_workers": resolve_max_workers(transfer.get("max_parallel_files")),
+        "chunk_size": max(1, int(chunk_size_mb * 1024 * 1024)),
+        "copy_mode": copy_mode,
+        "operation": operation,
+        "recursive": bool(transfer.get("recursive")),
+        "max_depth": transfer.get("max_depth"),
+        "exclude_dirs": transfer.get("exclude_dirs") or [],
+        "retries": max(0, int(transfer.get("retries") or 0)),
+        "verify": verify,
+    }
+
+def get_large_file_options(azure_configs):
+    """
+    Settings of the parallel range engine for large files. Data sources can tune
+    them through "parallel_threshold_mb", "parallel_chunk_size_mb" and
+    "parallel_concurrency" in their config; when both sides of a copy set a value
+    the smaller one is used.
+    """
+    def tuned(key, default):
+        values = [float(c[key]) for c in azure_configs if c and c.get(key)]
+        return min(values) if values else default
+
+    return {
+        "threshold": int(tuned("parallel_threshold_mb", LARGE_FILE_THRESHOLD_MB) * 1024 * 1024),
+        "chunk_size": max(1, int(tuned("parallel_chunk_size_mb", LARGE_FILE_CHUNK_SIZE_MB) * 1024 * 1024)),
+        "concurrency": max(1, int(tuned("parallel_concurrency", LARGE_FILE_CONCURRENCY))),
+    }
+
+def job_target(spec):
+    """
+    Describes the target of a job, or one of its additional_targets, for copy_fan_out.
+    """
+    if spec.get("targetType") == "azure":
+        return {
+            "type": "azure",
+            "id": spec.get("targetAzureId"),
+            "config": get_azure_config_by_id(spec.get("targetAzureId")),
+            "location": {"filesystem": spec.get("targetContainer"), "directory": spec.get("target")},
+        }
+    return {"type": spec.get("targetType"), "id": None, "config": None, "location": spec.get("target")}
+
+def dispatch_copy(job, report=None):
+    """
+    Runs the copy described by job and returns (copied_files, source_files).
+    If a report dict is given it is filled with details that do not fit the
+    return value, such as the files skipped by an incremental copy.
+    """
     source_type = job.get("sourceType")
     target_type = job.get("targetType")
     source = job.get("source")
     target = job.get("target")
     file_mask = job.get("sourceFileMask", "*")
     configs = {}
+    options = get_transfer_options(job)
 
     if source_type == "azure":
         azure_id = job.get("sourceAzureId")
@@ -251,14 +651,68 @@ def dispatch_copy(job):
             "directory": target
         }
 
+    # A fan-out job reads each source file once for its target and all additional targets
+    targets = []
+    if job.get("additional_targets"):
+        targets = [job_target(job)] + [job_target(spec) for spec in job["additional_targets"]]
+
+    options["large_file"] = get_large_file_options(
+        list(configs.values()) + [t["config"] for t in targets if t["config"]]
+    )
+    transfer = job.get("transfer") or {}
+    manifest = TransferManifest(job.get("id"), enabled=transfer.get("incremental"))
+    options["manifest"] = manifest
+    checkpoint = TransferCheckpoint(job.get("id"), run_key_for(job), enabled=transfer.get("resumable", True))
+    options["checkpoint"] = checkpoint
+    checksums = {}
+    options["checksums"] = checksums
+    totals = {"bytes_copied": 0}
+    options["totals"] = totals
+
     func = COPY_FUNCTIONS.get((source_type, target_type))
+    if (source_type, target_type) == ("azure", "azure") and options["copy_mode"] != "stream":
+        func = copy_azure_to_azure_server_side
+    if targets:
+        unsupported = [t["type"] for t in targets if t["type"] not in ("local", "shared", "azure")]
+        if source_type not in ("local", "shared", "azure") or unsupported:
+            raise NotImplementedError(f"Fan-out copy from {source_type} to {', '.join(unsupported) or target_type} not implemented")
+        if options["operation"] == "move":
+            raise NotImplementedError("Move cannot be combined with additional targets")
+        func = copy_fan_out
     if not func:
         raise NotImplementedError(f"Copy from {source_type} to {target_type} not implemented")
-    if (source_type, target_type) == ("azure", "azure"):
-        return func(source, target, file_mask, configs)
-    elif source_type == "azure":
-        return func(source, target, file_mask, configs.get("source_azure"))
+    # Azure sides of the copy, paced by their data source's bandwidth limit
+    data_sources = {}
+    if source_type == "azure":
+        data_sources["source"] = [(job.get("sourceAzureId"), configs["source_azure"])]
+    if targets:
+        data_sources["target"] = [(t["id"], t["config"]) for t in targets if t["type"] == "azure"]
     elif target_type == "azure":
-        return func(source, target, file_mask, configs.get("target_azure"))
-    else:
-        return func(source, target, file_mask)
\ No newline at end of file
+        data_sources["target"] = [(job.get("targetAzureId"), configs["target_azure"])]
+
+    succeeded = False
+    with governor.lease(job.get("id"), data_sources) as lease:
+        options["lease"] = lease
+        try:
+            if targets:
+                result = func(source, targets, file_mask, configs.get("source_azure"), options=options)
+            elif (source_type, target_type) == ("azure", "azure"):
+                result = func(source, target, file_mask, configs, options=options)
+            elif source_type == "azure":
+                result = func(source, target, file_mask, configs.get("source_azure"), options=options)
+            elif target_type == "azure":
+                result = func(source, target, file_mask, configs.get("target_azure"), options=options)
+            else:
+                result = func(source, target, file_mask, options=options)
+            succeeded = True
+            return result
+        finally:
+            # Record whatever was delivered, even when part of the batch failed,
+            # and keep the checkpoint of a failed run so the next attempt resumes it
+            manifest.save()
+            checkpoint.finish(succeeded)
+            if report is not None:
+                report["skipped_files"] = list(manifest.skipped_files)
+                report["resumed_files"] = list(checkpoint.resumed_files)
+                report["checksums"] = dict(checksums)
+                report["bytes_copied"] = totals["bytes_copied"]
\ No newline at end of file
@@ -0,0 +1,264 @@
+import os
+import threading
+import time
+import uuid
+from bisect import insort
+from collections import deque
+from datetime import datetime
+from backend.config.settings import (
+    JOB_EXECUTOR_WORKERS, JOB_QUEUE_MAX, JOB_QUEUE_FILE, JOB_WAIT_SAMPLES, DATA_SOURCE_MAX_CONCURRENT_JOBS
+)
+from backend.app.services.job_runner import execute_job, JobNotFoundError
+from backend.storage.data_source_storage import load_data_source_by_id
+from backend.storage.job_details_storage import load_job_by_id
+from backend.storage.json_cache import load_json, save_json
+from backend.storage.run_history_storage import write_run_status
+
+# Highest priority first; waiting runs start in priority order, then in the order they were queued
+PRIORITIES = ("manual", "scheduled", "backfill")
+
+
+class QueueFullError(Exception):
+    pass
+
+
+def priority_for(job, trigger_type, requested=None):
+    """
+    Manual runs come first, then scheduled runs; scheduled runs of a time
+    travel job replay past dates and go last as backfill.
+    """
+    if requested:
+        if requested not in PRIORITIES:
+            raise ValueError(f"Unknown priority '{requested}'. Expected one of: {', '.join(PRIORITIES)}.")
+        return requested
+    if trigger_type == "manual":
+        return "manual"
+    if (job.get("time_travel") or {}).get("enabled"):
+        return "backfill"
+    return "scheduled"
+
+def data_sources_of(job):
+    # Azure data sources a run reads from or writes to
+    ids = [job.get("sourceAzureId") if job.get("sourceType") == "azure" else None]
+    ids.append(job.get("targetAzureId") if job.get("targetType") == "azure" else None)
+    ids += [t.get("targetAzureId") for t in job.get("additional_targets") or [] if t.get("targetType") == "azure"]
+    return sorted({str(i) for i in ids if i})
+
+def max_concurrent_jobs(data_source_id):
+    """
+    Jobs allowed to use a data source at once ("max_concurrent_jobs" in its config,
+    DATA_SOURCE_MAX_CONCURRENT_JOBS otherwise), or None when unlimited.
+    """
+    try:
+        config = load_data_source_by_id(data_source_id).get("config") or {}
+    except ValueError:
+        config = {}
+    value = config.get("max_concurrent_jobs") if isinstance(config, dict) else None
+    try:
+        limit = int(value) if value else DATA_SOURCE_MAX_CONCURRENT_JOBS
+    except (TypeError, ValueError):
+        limit = DATA_SOURCE_MAX_CONCURRENT_JOBS
+    return limit if limit and limit > 0 else None
+
+
+class JobExecutor:
+    """
+    Runs jobs on a fixed pool of worker threads, separate from the API's threads.
+    Runs wait in a priority queue kept in JOB_QUEUE_FILE, so queued and interrupted
+    runs start again after a restart (interrupted copies resume from their checkpoint).
+    A waiting run starts once a worker is free, no other run of the same job is in
+    progress, and each of its data sources is below its max_concurrent_jobs; runs
+    that cannot start yet do not hold up those behind them.
+    """
+    def __init__(self, workers, max_queued, queue_file):
+        self.workers = workers
+        self.max_queued = max_queued
+        self.queue_file = queue_file
+        self._cond = threading.Condition()
+        self._pending = []  # (priority rank, sequence, entry), kept sorted
+        self._running = {}
+        self._source_jobs = {}
+        self._seq = 0
+        self._reserved = 0  # Queue places held by submits writing their "queued" status
+        self._waits = deque(maxlen=JOB_WAIT_SAMPLES)
+        self._completed = {"succeeded": 0, "failed": 0}
+        self._started = False
+
+    def _persist(self):
+        save_json(self.queue_file, {
+            "pending": [entry for _, _, entry in self._pending],
+            "running": list(self._running.values()),
+        })
+
+    def _add(self, entry):
+        entry["seq"] = self._seq
+        self._seq += 1
+        insort(self._pending, (PRIORITIES.index(entry["priority"]), entry["seq"], entry))
+
+    def submit(self, job_id, trigger_type="manual", scheduler_id=None, priority=None):
+        """
+        Queues a run of a job and returns its queue entry; the run is recorded as "queued"
+        in the run history. Raises JobNotFoundError, ValueError for an unknown priority,
+        or QueueFullError when JOB_QUEUE_MAX runs are already waiting.
+        """
+        job = load_job_by_id(job_id)
+        if not job:
+            raise JobNotFoundError(f"Job {job_id} not found")
+        entry = {
+            "run_id": str(uuid.uuid4()),
+            "job_id": job_id,
+            "trigger_type": trigger_type,
+            "scheduler_id": scheduler_id,
+            "priority": priority_for(job, trigger_type, priority),
+            "data_sources": data_sources_of(job),
+            "enqueued_at": time.time(),
+        }
+        # A place is held while the status is written without the lock, so the run
+        # is recorded as queued before a worker can take it, and the queue cannot overfill
+        with self._cond:
+            if len(self._pending) + self._reserved >= self.max_queued:
+                raise QueueFullError(f"{len(self._pending)} runs are already waiting; try again later.")
+            self._reserved += 1
+        try:
+            write_run_status(
+                job_id, entry["run_id"], status="queued", message="Waiting to run...",
+                trigger_type=trigger_type, scheduler_id=scheduler_id, extra_details={"priority": entry["priority"]}
+            )
+        except Exception:
+            with self._cond:
+                self._reserved -= 1
+            raise
+        with self._cond:
+            self._reserved -= 1
+            self._add(entry)
+            self._persist()
+            self._cond.notify()
+            position = next(i for i, (_, _, e) in enumerate(self._pending) if e is entry)
+            return {**entry, "position": position}
+
+    def _take_next(self):
+        # Each data source's limit is looked up at most once per pass, not once per waiting run
+        running_jobs = {running["job_id"] for running in self._running.values()}
+        limits = {}
+        for i, (_, _, entry) in enumerate(self._pending):
+            if entry["job_id"] in running_jobs:
+                continue
+            for data_source_id in entry["data_sources"]:
+                if data_source_id not in limits:
+                    limits[data_source_id] = max_concurrent_jobs(data_source_id)
+                limit = limits[data_source_id]
+                if limit is not None and self._source_jobs.get(data_source_id, 0) >= limit:
+                    break
+            else:
+                del self._pending[i]
+                return entry
+        return None
+
+    def _work(self):
+        while True:
+            with self._cond:
+                entry = self._take_next()
+                while entry is None:
+                    self._cond.wait()
+                    entry = self._take_next()
+                entry["started_at"] = time.time()
+                self._waits.append(entry["started_at"] - entry["enqueued_at"])
+                self._running[entry["run_id"]] = entry
+                for data_source_id in entry["data_sources"]:
+                    self._source_jobs[data_source_id] = self._source_jobs.get(data_source_id, 0) + 1
+                self._persist()
+            succeeded = False
+            try:
+                result = execute_job(
+                    entry["job_id"], trigger_type=entry["trigger_type"],
+                    scheduler_id=entry["scheduler_id"], run_id=entry["run_id"]
+                )
+                succeeded = bool(result.get("success"))
+            except JobNotFoundError as e:
+                write_run_status(
+                    entry["job_id"], entry["run_id"], status="Failed", message="The job was deleted before it ran.",
+                    trigger_type=entry["trigger_type"], scheduler_id=entry["scheduler_id"]
+                )
+                print(f"Cannot run job {entry['job_id']}: {e}")
+            except Exception as e:
+                print(f"Job {entry['job_id']} (run {entry['run_id']}) failed: {e}")
+            finally:
+                with self._cond:
+                    self._running.pop(entry["run_id"], None)
+                    for data_source_id in entry["data_sources"]:
+                        self._source_jobs[data_source_id] -= 1
+                        if not self._source_jobs[data_source_id]:
+                            del self._source_jobs[data_source_id]
+                    self._completed["succeeded" if succeeded else "failed"] += 1
+                    self._persist()
+                    # A finished run may unblock runs waiting on its job or data sources
+                    self._cond.notify_all()
+
+    def start(self):
+        """
+        Restores the persisted queue, runs that were in progress first, and starts the workers.
+        """
+        with self._cond:
+            if self._started:
+                return
+            self._started = True
+            saved = load_json(self.queue_file, default={})
+            for entry in saved.get("running", []) + saved.get("pending", []):
+                entry.pop("started_at", None)
+                self._add(entry)
+            if self._pending:
+                print(f"[{datetime.now()}] Restored {len(self._pending)} queued job runs.")
+                self._persist()
+        for _ in range(self.workers):
+            threading.Thread(target=self._work, daemon=True).start()
+
+    def queue(self):
+        """
+        Waiting runs in the order they will be considered, and the runs in progress.
+        """
+        with self._cond:
+            return {
+                "pending": [dict(entry) for _, _, entry in self._pending],
+                "running": [dict(entry) for entry in self._running.values()],
+            }
+
+    def metrics(self):
+        with self._cond:
+            source_ids = set(self._source_jobs) | {d for _, _, e in self._pending for d in e["data_sources"]}
+        # Limits are read from storage outside the lock the workers and submit need
+        limits = {data_source_id: max_concurrent_jobs(data_source_id) for data_source_id in source_ids}
+        with self._cond:
+            now = time.time()
+            waits = sorted(self._waits)
+            by_priority = {priority: 0 for priority in PRIORITIES}
+            for _, _, entry in self._pending:
+                by_priority[entry["priority"]] += 1
+            return {
+                "workers": self.workers,
+                "running": len(self._running),
+                "queued": len(self._pending),
+                "max_queued": self.max_queued,
+                "queued_by_priority": by_priority,
+                "oldest_wait_seconds": max((now - e["enqueued_at"] for _, _, e in self._pending), default=0),
+                "wait_seconds": {
+                    "samples": len(waits),
+                    "avg": sum(waits) / len(waits) if waits else 0,
+                    "p95": waits[min(len(waits) - 1, int(len(waits) * 0.95))] if waits else 0,
+                    "max": waits[-1] if waits else 0,
+                },
+                "completed": dict(self._completed),
+                "data_sources": {
+                    data_source_id: {
+                        "running": self._source_jobs.get(data_source_id, 0),
+                        "max_concurrent_jobs": limits[data_source_id],
+                    }
+                    for data_source_id in sorted(limits)
+                },
+            }
+
+
+executor = JobExecutor(JOB_EXECUTOR_WORKERS, JOB_QUEUE_MAX, JOB_QUEUE_FILE)
+
+def start_job_executor():
+    os.makedirs(os.path.dirname(JOB_QUEUE_FILE) or ".", exist_ok=True)
+    executor.start()
@@ -0,0 +1,232 @@
+import functools
+import io
+import json
+import uuid
+from datetime import datetime, timedelta
+from backend.app.services.copy_manager import dispatch_copy
+from backend.app.services.transfer_pool import PartialCopyError
+from backend.storage.run_history_storage import write_run_status
+from backend.storage.global_variable_storage import load_global_variables
+from backend.storage.job_details_storage import load_job_by_id
+from backend.utils.replace_placeholders import resolve_placeholders, find_missing_placeholders
+from backend.utils.time_travel_utils import get_mocked_datetime_env, patch_datetime_calls
+
+# Execution core of a job run, used by the job executor's workers (see job_executor).
+# execute_job runs a job synchronously; the outcome is recorded in the run history.
+
+
+class JobNotFoundError(LookupError):
+    pass
+
+
+def execute_job(job_id, trigger_type="manual", scheduler_id=None, run_id=None):
+    """
+    Runs a job to completion in the calling thread and records it in the run history.
+    Returns the run result: for a time travel job {"success", "parent_run_id", "date_runs"},
+    otherwise the result of today's run.
+    Raises JobNotFoundError if there is no such job; any other error is recorded
+    as a failed run and re-raised.
+    """
+    parent_run_id = run_id or str(uuid.uuid4())
+    job = load_job_by_id(job_id)
+    if not job:
+        raise JobNotFoundError(f"Job {job_id} not found")
+    try:
+        global_vars = {v["name"]: v["value"] for v in load_global_variables()}
+        local_vars_list = job.get("local_variables", [])
+        local_vars = {v["name"]: v["value"] for v in local_vars_list} if local_vars_list else {}
+        
+        # --- NEW: Write "executing" status at the start ---
+        write_run_status(
+            job_id,
+            parent_run_id,
+            status="executing",
+            message="Job is running...",
+            trigger_type=trigger_type,
+            scheduler_id=scheduler_id,
+            extra_details={}
+        )
+        # --- END NEW ---
+        
+        # Check for time travel config
+        time_travel = job.get("time_travel", {})
+        time_travel_enabled = time_travel.get("enabled", False)
+        from_date = time_travel.get("from_date")
+        to_date = time_travel.get("to_date")
+
+        # Helper to run the job for a specific date (for time travel)
+        def run_for_date(run_id, run_date_str, original_job):
+            error_message = ""
+            job = json.loads(json.dumps(original_job))
+            updated = False
+            for v in local_vars_list:
+                if v["type"] == "dynamic":
+                    code = v.get("expression", "")
+                    value = None
+                    output = io.StringIO()
+                    try:
+                        mocked_env = get_mocked_datetime_env(datetime.strptime(run_date_str, '%Y-%m-%d').date())
+                        # Runs execute concurrently, so output is captured with a print of this
+                        # call's own instead of by swapping the process-wide sys.stdout
+                        mocked_env["print"] = functools.partial(print, file=output)
+                        patched_code = patch_datetime_calls(code)
+                        exec(patched_code, mocked_env, {})
+                        val = output.getvalue()
+                        value = val.strip() if val else "Code executed. No output."
+                    except Exception as e:
+                        value = f"Error: {e}"
+                        error_message += f"Dynamic variable error ({v['name']}): {e}\n"
+                    v["value"] = str(value)
+                    updated = True
+            # Always assign local_vars, even if local_vars_list is empty
+            local_vars = {v["name"]: v["value"] for v in local_vars_list}
+
+            # Validate placeholders
+            fields_to_check = [
+                "source", "target", "sourceFileMask", "targetFileMask",
+                "sourceContainer", "targetContainer"
+            ]
+            # (label, dict holding the field, field name), including each additional target
+            placeholder_fields = [(field, job, field) for field in fields_to_check]
+            for i, extra in enumerate(job.get("additional_targets") or []):
+                placeholder_fields += [
+                    (f"additional_targets[{i}].{field}", extra, field) for field in ("target", "targetContainer")
+                ]
+            error_detail = {}
+            error_msg_lines = []
+            for label, holder, field in placeholder_fields:
+                if field in holder and isinstance(holder[field], str):
+                    errors = find_missing_placeholders(holder[field], global_vars, local_vars)
+                    if errors:
+                        error_detail[label] = errors
+                        error_msg_lines.append(f"{label}: " + "; ".join(errors))
+            if error_detail:
+                error_msg = "\n".join(error_msg_lines)
+                error_message += error_msg
+                return {
+                    "success": False,
+                    "error": error_detail,
+                    "run_id": run_id,
+                    "date": run_date_str,
+                    "status": "Failed",
+                    "message": error_message,
+                    "file_mask_used": job.get("sourceFileMask", "*"),
+                    "source_files": [],
+                    "copied_files": [],
+                    "failed_files": [],
+                    "skipped_files": [],
+                    "resumed_files": [],
+                    "checksums": {},
+                    "bytes_copied": 0
+                }
+
+            # Do the replacements
+            for _, holder, field in placeholder_fields:
+                if field in holder and isinstance(holder[field], str):
+                    holder[field] = resolve_placeholders(holder[field], global_vars, local_vars)
+
+            # Perform the copy logic
+            failed_files = []
+            report = {}
+            try:
+                copied_files, source_files = dispatch_copy(job, report)
+                status = "Success"
+                message = f"Copied {len(copied_files)} files for date {run_date_str}."
+                if report.get("skipped_files"):
+                    message += f" Skipped {len(report['skipped_files'])} unchanged files."
+                if report.get("resumed_files"):
+                    message += f" Resumed {len(report['resumed_files'])} files completed by an earlier attempt."
+            except PartialCopyError as pce:
+                copied_files = pce.copied_files
+                source_files = pce.source_files
+                failed_files = pce.failed_files
+                status = "Failed"
+                message = f"Copied {len(copied_files)} files for date {run_date_str}; {pce}"
+                error_message += message
+            except NotImplementedError as nie:
+                copied_files = []
+                source_files = []
+                status = "Failed"
+                message = f"Copy logic not implemented: {nie}"
+                error_message += message
+            except Exception as copy_exc:
+                copied_files = []
+                source_files = []
+                status = "Failed"
+                message = f"Copy failed: {repr(copy_exc)}"
+                error_message += message
+
+            return {
+                "success": status == "Success",
+                "status": status,
+                "message": message if status == "Success" else error_message or message,
+                "run_id": run_id,
+                "date": run_date_str,
+                "file_mask_used": job.get("sourceFileMask", "*"),
+                "source_files": source_files,
+                "copied_files": copied_files,
+                "failed_files": failed_files,
+                "skipped_files": report.get("skipped_files", []),
+                "resumed_files": report.get("resumed_files", []),
+                "checksums": report.get("checksums", {}),
+                "bytes_copied": report.get("bytes_copied", 0)
+            }
+
+        # If time travel is enabled and dates are valid, run for each date in range and store as a single parent run
+        if time_travel_enabled and from_date and to_date:
+            from_dt = datetime.strptime(from_date, "%Y-%m-%d")
+            to_dt = datetime.strptime(to_date, "%Y-%m-%d")
+            date_runs = []
+            num_days = (to_dt - from_dt).days
+            for n in range(num_days + 1):  # inclusive
+                this_date = from_dt + timedelta(days=n)
+                run_id_date = f"{parent_run_id}-{this_date.strftime('%Y%m%d')}"
+                result = run_for_date(run_id_date, this_date.strftime('%Y-%m-%d'), job)
+                date_runs.append(result)
+            # Write a single parent run with all date results
+            write_run_status(
+                job_id,
+                parent_run_id,
+                status="Success" if all(r["success"] for r in date_runs) else "Failed",
+                message="Time travel run completed for date range.",
+                trigger_type=trigger_type,
+                scheduler_id=scheduler_id,
+                skipped_count=sum(len(r.get("skipped_files", [])) for r in date_runs),
+                extra_details={
+                    "from_date": from_date,
+                    "to_date": to_date,
+                    "date_runs": date_runs
+                }
+            )
+            return {
+                "success": all(r["success"] for r in date_runs),
+                "parent_run_id": parent_run_id,
+                "date_runs": date_runs
+            }
+        else:
+            # Normal run for today's date
+            today_str = datetime.now().strftime('%Y-%m-%d')
+            result = run_for_date(parent_run_id, today_str, job)
+            write_run_status(
+                job_id,
+                parent_run_id,
+                status=result.get("status", "Failed"),
+                message=result.get("message", ""),
+                trigger_type=trigger_type,
+                scheduler_id=scheduler_id,
+                skipped_count=len(result.get("skipped_files", [])),
+                extra_details={"date_runs": [result]}
+            )
+            return result
+    except Exception as e:
+        # Always log the failed run in run history for visibility in UI
+        write_run_status(
+            job_id,
+            parent_run_id,
+            status="Failed",
+            message=f"Unexpected error: {e}",
+            trigger_type=trigger_type,
+            scheduler_id=scheduler_id,
+            extra_details={"date_runs": [], "error_detail": str(e)}
+        )
+        raise
@@ -0,0 +1,67 @@
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from backend.config.settings import (
+    RUN_HISTORY_KEEP_RUNS, RUN_HISTORY_KEEP_DAYS, RUN_HISTORY_DETAIL_DAYS, RUN_HISTORY_COMPACT_INTERVAL
+)
+from backend.storage.job_details_storage import load_jobs
+from backend.storage.run_history_storage import RUN_HISTORY_DIR, compact_run_history
+
+HISTORY_FILE_PATTERN = re.compile(r"^run_history_(.+)\.jsonl?$")
+
+def retention_for(job):
+    """
+    Returns (keep_runs, keep_days, detail_days) for a job: its own retention
+    settings where given, the RUN_HISTORY_* defaults otherwise.
+    """
+    retention = (job or {}).get("retention") or {}
+    pick = lambda key, default: retention.get(key) if retention.get(key) is not None else default
+    return (
+        pick("keep_runs", RUN_HISTORY_KEEP_RUNS),
+        pick("keep_days", RUN_HISTORY_KEEP_DAYS),
+        pick("detail_days", RUN_HISTORY_DETAIL_DAYS),
+    )
+
+def compact_all_run_history():
+    """
+    Compacts the run history of every job, including jobs that have since been
+    deleted (their history is kept under the default retention).
+    """
+    jobs = {str(job.get("id")): job for job in load_jobs()}
+    job_ids = set()
+    if os.path.isdir(RUN_HISTORY_DIR):
+        for name in os.listdir(RUN_HISTORY_DIR):
+            match = HISTORY_FILE_PATTERN.match(name)
+            if match:
+                job_ids.add(match.group(1))
+    totals = {"jobs": 0, "archived_runs": 0, "archived_details": 0}
+    for job_id in sorted(job_ids):
+        keep_runs, keep_days, detail_days = retention_for(jobs.get(job_id))
+        try:
+            result = compact_run_history(job_id, keep_runs, keep_days, detail_days)
+        except Exception as e:
+            print(f"[{datetime.now()}] Run history compaction failed for job {job_id}: {e}")
+            continue
+        if result:
+            totals["jobs"] += 1
+            totals["archived_runs"] += result["archived_runs"]
+            totals["archived_details"] += result["archived_details"]
+    print(
+        f"[{datetime.now()}] Compacted run history of {totals['jobs']} jobs: "
+        f"{totals['archived_runs']} runs and {totals['archived_details']} run details archived."
+    )
+    return totals
+
+def run_history_compaction_loop():
+    while True:
+        try:
+            compact_all_run_history()
+        except Exception as e:
+            print(f"[{datetime.now()}] Run history compaction failed: {e}")
+        time.sleep(RUN_HISTORY_COMPACT_INTERVAL)
+
+def start_run_history_compactor():
+    t = threading.Thread(target=run_history_compaction_loop, daemon=True)
+    t.start()
@@ -1,204 +1,235 @@
+import heapq
 import threading
-import time
-import json
-import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import pytz
-import requests
-import holidays
+from backend.config.settings import SCHEDULER_INTERVAL, SCHEDULER_MISFIRE_GRACE
+from backend.storage.schedule_storage import load_schedules
+from backend.app.services.job_executor import executor
+from backend.utils.business_calendar import get_calendar, nth_day
 
-uk_holidays = holidays.country_holidays('GB', subdiv='England', years=range(datetime.now().year, datetime.now().year + 2))
-SCHEDULE_FILE = "backend/data/schedules.json"
-API_URL = "http://localhost:8000"  # Adjust if your FastAPI runs elsewhere
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+# Years searched ahead for the next fire of a custom schedule
+CUSTOM_SCHEDULE_HORIZON_YEARS = 3
 
 
-def load_schedules():
-    if not os.path.exists(SCHEDULE_FILE):
-        return []
-    with open(SCHEDULE_FILE, "r") as f:
-        return json.load(f)
-
-def is_business_day(dt):
+def is_business_day(dt, calendar=None):
     # dt should be a datetime object
-    # Check if it's a weekday and not a UK holiday
-    return dt.weekday() < 5 and dt.date() not in uk_holidays
-
-def nth_business_day_of_month(dt, n):
-    count = 0
-    for day in range(1, 32):
-        try:
-            d = dt.replace(day=day)
-        except ValueError:
-            break
-        if is_business_day(d):
-            count += 1
-            if count == n:
-                return d
-    return None
+    # Check if it's a weekday and not a holiday of the calendar (DEFAULT_HOLIDAY_CALENDAR if None)
+    return (calendar or get_calendar()).is_business_day(dt.date())
+
+def _as_datetime(day, dt):
+    return datetime(day.year, day.month, day.day, tzinfo=dt.tzinfo) if day else None
+
+def nth_business_day_of_month(dt, n, calendar=None):
+    return _as_datetime((calendar or get_calendar()).nth_business_day(dt.year, dt.month, 1, n), dt)
 
 def nth_day_of_month(dt, n):
-    try:
-        return dt.replace(day=n)
-    except ValueError:
-        return None
+    return _as_datetime(nth_day(dt.year, dt.month, 1, n), dt)
 
-def nth_business_day_of_quarter(dt, n, q):
-    year = dt.year
-    month = 3 * (q - 1) + 1
-    count = 0
-    for m in range(month, month + 3):
-        for day in range(1, 32):
-            try:
-                d = datetime(year, m, day, tzinfo=dt.tzinfo)
-            except ValueError:
-                break
-            if is_business_day(d):
-                count += 1
-                if count == n:
-                    return d
-    return None
+def nth_business_day_of_quarter(dt, n, q, calendar=None):
+    return _as_datetime((calendar or get_calendar()).nth_business_day(dt.year, 3 * (q - 1) + 1, 3, n), dt)
 
 def nth_day_of_quarter(dt, n, q):
-    year = dt.year
-    month = 3 * (q - 1) + 1
-    days = []
-    for m in range(month, month + 3):
-        for day in range(1, 32):
-            try:
-                d = datetime(year, m, day, tzinfo=dt.tzinfo)
-                days.append(d)
-            except ValueError:
-                break
-    if 0 < n <= len(days):
-        return days[n - 1]
-    return None
+    return _as_datetime(nth_day(dt.year, 3 * (q - 1) + 1, 3, n), dt)
 
-def nth_business_day_of_halfyear(dt, n, h):
-    year = dt.year
-    month = 1 if h == 1 else 7
-    count = 0
-    for m in range(month, month + 6):
-        for day in range(1, 32):
-            try:
-                d = datetime(year, m, day, tzinfo=dt.tzinfo)
-            except ValueError:
-                break
-            if is_business_day(d):
-                count += 1
-                if count == n:
-                    return d
-    return None
+def nth_business_day_of_halfyear(dt, n, h, calendar=None):
+    return _as_datetime((calendar or get_calendar()).nth_business_day(dt.year, 1 if h == 1 else 7, 6, n), dt)
 
 def nth_day_of_halfyear(dt, n, h):
-    year = dt.year
-    month = 1 if h == 1 else 7
-    days = []
-    for m in range(month, month + 6):
-        for day in range(1, 32):
-            try:
-                d = datetime(year, m, day, tzinfo=dt.tzinfo)
-                days.append(d)
-            except ValueError:
-                break
-    if 0 < n <= len(days):
-        return days[n - 1]
-    return None
+    return _as_datetime(nth_day(dt.year, 1 if h == 1 else 7, 6, n), dt)
 
-def nth_business_day_of_annually(dt, n, y):
+def nth_business_day_of_annually(dt, n, y, calendar=None):
     # y is always 1 for annually
-    year = dt.year
-    count = 0
-    for m in range(1, 13):
-        for day in range(1, 32):
-            try:
-                d = datetime(year, m, day, tzinfo=dt.tzinfo)
-            except ValueError:
-                break
-            if is_business_day(d):
-                count += 1
-                if count == n:
-                    return d
-    return None
+    return _as_datetime((calendar or get_calendar()).nth_business_day(dt.year, 1, 12, n), dt)
 
 def nth_day_of_annually(dt, n, y):
     # y is always 1 for annually
-    year = dt.year
-    days = []
-    for m in range(1, 13):
-        for day in range(1, 32):
-            try:
-                d = datetime(year, m, day, tzinfo=dt.tzinfo)
-                days.append(d)
-            except ValueError:
-                break
-    if 0 < n <= len(days):
-        return days[n - 1]
+    return _as_datetime(nth_day(dt.year, 1, 12, n), dt)
+
+def _custom_target_days(custom, start, calendar):
+    """
+    Yields the days a custom schedule targets, in order, from the period
+    containing start (a date) up to CUSTOM_SCHEDULE_HORIZON_YEARS ahead.
+    Business days are those of calendar.
+    """
+    ctype = custom.get("type")
+    x = int(custom.get("x", 1))
+    y = int(custom.get("y", 1)) if custom.get("y") else 1
+    kwargs = {"calendar": calendar} if (ctype or "").startswith("business_day_") else {}
+    if ctype in ("business_day_month", "day_month"):
+        nth = nth_business_day_of_month if ctype == "business_day_month" else nth_day_of_month
+        periods = (
+            (datetime(start.year + (start.month - 1 + k) // 12, (start.month - 1 + k) % 12 + 1, 1), ())
+            for k in range(12 * CUSTOM_SCHEDULE_HORIZON_YEARS + 1)
+        )
+    else:
+        nth = {
+            "business_day_quarter": nth_business_day_of_quarter,
+            "day_quarter": nth_day_of_quarter,
+            "business_day_halfyear": nth_business_day_of_halfyear,
+            "day_halfyear": nth_day_of_halfyear,
+            "business_day_annually": nth_business_day_of_annually,
+            "day_annually": nth_day_of_annually,
+        }.get(ctype)
+        if nth is None:
+            return
+        periods = (
+            (datetime(year, 1, 1), (y,))
+            for year in range(start.year, start.year + CUSTOM_SCHEDULE_HORIZON_YEARS + 1)
+        )
+    # Periods are generated lazily, so only the years actually reached are looked up
+    for period_start, extra in periods:
+        target = nth(period_start, x, *extra, **kwargs)
+        if target is not None:
+            yield target.date()
+
+def _fire_days(sch, start):
+    # Candidate days of a schedule, in order, from start (a date in the schedule's timezone)
+    custom = sch.get("customScheduler")
+    if custom:
+        yield from _custom_target_days(custom, start, get_calendar(sch.get("calendar")))
+    else:
+        weekdays = set(sch.get("weekdays", []))
+        for n in range(8):
+            day = start + timedelta(days=n)
+            if WEEKDAYS[day.weekday()] in weekdays:
+                yield day
+
+def next_fire_time(sch, after):
+    """
+    Returns the first time (aware, UTC) after `after` at which the schedule fires,
+    or None if it never does. Business-day schedules count the days of the
+    schedule's "calendar" (see get_calendar). A time that falls in a DST gap fires at the
+    equivalent time after the shift; a repeated time fires once.
+    """
+    hour, minute = (int(part) for part in sch.get("time", "").split(":"))
+    tz = pytz.timezone(sch.get("timezone") or "UTC")
+    for day in _fire_days(sch, after.astimezone(tz).date()):
+        fire_at = tz.normalize(tz.localize(datetime(day.year, day.month, day.day, hour, minute)))
+        if fire_at > after:
+            return fire_at.astimezone(pytz.utc)
     return None
 
-def check_and_run_jobs():
-    while True:
-        schedules = load_schedules()
-        now_utc = datetime.utcnow()
-        for sch in schedules:
-            # --- Ignore paused/disabled schedules ---
-            if sch.get("paused"):
-                continue
-            
-            tz = pytz.timezone(sch.get("timezone", "UTC"))
-            now = now_utc.replace(tzinfo=pytz.utc).astimezone(tz)
-            time_str = now.strftime("%H:%M")
-            custom = sch.get("customScheduler")
-            should_run = False
-
-            if custom:
-                ctype = custom.get("type")
-                x = int(custom.get("x", 1))
-                y = int(custom.get("y", 1)) if custom.get("y") else 1
-
-                if ctype == "business_day_month":
-                    target = nth_business_day_of_month(now, x)
-                elif ctype == "day_month":
-                    target = nth_day_of_month(now, x)
-                elif ctype == "business_day_quarter":
-                    target = nth_business_day_of_quarter(now, x, y)
-                elif ctype == "day_quarter":
-                    target = nth_day_of_quarter(now, x, y)
-                elif ctype == "business_day_halfyear":
-                    target = nth_business_day_of_halfyear(now, x, y)
-                elif ctype == "day_halfyear":
-                    target = nth_day_of_halfyear(now, x, y)
-                elif ctype == "business_day_annually":
-                    target = nth_business_day_of_annually(now, x, y)
-                elif ctype == "day_annually":
-                    target = nth_day_of_annually(now, x, y)
-                else:
-                    target = None
-
-                if target and target.date() == now.date() and time_str == sch.get("time", ""):
-                    should_run = True
-            else:
-                weekday = now.strftime("%A")
-                if (
-                    weekday in sch.get("weekdays", [])
-                    and time_str == sch.get("time", "")
-                ):
-                    should_run = True
-
-            if should_run:
+def preview_fire_times(sch, count, after=None):
+    """
+    Returns the next `count` fire times of a schedule (aware, UTC), paused or not.
+    """
+    fire_times = []
+    fire_at = after or datetime.now(pytz.utc)
+    while len(fire_times) < count:
+        fire_at = next_fire_time(sch, fire_at)
+        if fire_at is None:
+            break
+        fire_times.append(fire_at)
+    return fire_times
+
+def trigger_scheduled_run(sch, fire_at):
+    # Queues the run and returns; its outcome goes to the run history
+    entry = executor.submit(sch["jobId"], trigger_type="scheduled", scheduler_id=sch.get("id"))
+    print(f"Queued job {sch['jobId']} (Scheduler ID: {sch.get('id')}, run {entry['run_id']}) for {fire_at}")
+
+
+class ScheduleEngine:
+    """
+    Runs schedules at their next fire time. Each active schedule's next fire
+    time is computed once and kept in a heap; the engine sleeps until the
+    earliest one, fires it and recomputes only that schedule. Schedules are
+    re-read when notify() is called after a change, and at least every
+    SCHEDULER_INTERVAL seconds to pick up edits made outside the API; only
+    schedules that changed are recomputed. A fire more than
+    SCHEDULER_MISFIRE_GRACE seconds late (e.g. after the host slept) is skipped.
+    """
+    def __init__(self, trigger):
+        self._trigger = trigger
+        self._cond = threading.Condition()
+        self._heap = []  # (fire_at, schedule_id); entries no longer in _next are stale
+        self._schedules = {}
+        self._next = {}
+        self._changed = True
+
+    def notify(self):
+        with self._cond:
+            self._changed = True
+            self._cond.notify_all()
+
+    def _plan(self, schedule_id, after):
+        sch = self._schedules[schedule_id]
+        fire_at = None
+        if not sch.get("paused"):
+            try:
+                fire_at = next_fire_time(sch, after)
+            except Exception as e:
+                print(f"Invalid schedule {schedule_id}: {e}")
+        if fire_at is None:
+            self._next.pop(schedule_id, None)
+            return
+        self._next[schedule_id] = fire_at
+        heapq.heappush(self._heap, (fire_at, schedule_id))
+
+    def _reload(self, now):
+        schedules = {str(sch.get("id")): sch for sch in load_schedules()}
+        for schedule_id in list(self._schedules):
+            if schedule_id not in schedules:
+                del self._schedules[schedule_id]
+                self._next.pop(schedule_id, None)
+        for schedule_id, sch in schedules.items():
+            if self._schedules.get(schedule_id) != sch:
+                self._schedules[schedule_id] = sch
+                self._plan(schedule_id, now)
+
+    def _earliest(self):
+        while self._heap:
+            fire_at, schedule_id = self._heap[0]
+            if self._next.get(schedule_id) == fire_at:
+                return fire_at, schedule_id
+            heapq.heappop(self._heap)
+        return None
+
+    def upcoming(self, count):
+        """
+        Returns the next `count` fires across all active schedules, earliest first.
+        """
+        with self._cond:
+            pending = sorted((fire_at, schedule_id) for schedule_id, fire_at in self._next.items())[:count]
+            return [(self._schedules[schedule_id], fire_at) for fire_at, schedule_id in pending]
+
+    def run(self):
+        while True:
+            with self._cond:
+                now = datetime.now(pytz.utc)
+                self._reload(now)
+                self._changed = False
+                due = []
+                earliest = self._earliest()
+                while earliest and earliest[0] <= now:
+                    fire_at, schedule_id = earliest
+                    due.append((self._schedules[schedule_id], fire_at))
+                    # Fires missed by more than the grace period are not caught up
+                    self._plan(schedule_id, max(fire_at, now - timedelta(seconds=SCHEDULER_MISFIRE_GRACE)))
+                    earliest = self._earliest()
+                if not due:
+                    timeout = SCHEDULER_INTERVAL
+                    if earliest:
+                        timeout = min(timeout, max(0, (earliest[0] - now).total_seconds()))
+                    self._cond.wait(timeout)
+            for sch, fire_at in due:
+                if (now - fire_at).total_seconds() > SCHEDULER_MISFIRE_GRACE:
+                    print(f"Skipped job {sch.get('jobId')} (Scheduler ID: {sch.get('id')}): missed its {fire_at} run")
+                    continue
                 try:
-                    requests.post(
-                        f"{API_URL}/jobs/{sch['jobId']}/run",
-                        json={
-                            "trigger_type": "scheduled",
-                            "scheduler_id": sch.get("id")
-                        },
-                        timeout=5
-                    )
-                    print(f"Triggered job {sch['jobId']} (Scheduler ID: {sch.get('id')}) at {now}")
+                    self._trigger(sch, fire_at)
                 except Exception as e:
-                    print(f"Failed to trigger job {sch['jobId']}: {e}")
-        time.sleep(60)  # Check every minute
-        
+                    print(f"Failed to trigger job {sch.get('jobId')}: {e}")
+
+
+scheduler = ScheduleEngine(trigger_scheduled_run)
+
+def notify_schedules_changed():
+    """
+    Wakes the scheduler to re-read schedules; call after saving them.
+    """
+    scheduler.notify()
+
 def start_scheduler():
-    t = threading.Thread(target=check_and_run_jobs, daemon=True)
-    t.start()
\ No newline at end of file
+    t = threading.Thread(target=scheduler.run, daemon=True)
+    t.start()
@@ -0,0 +1,83 @@
+import time
+from urllib.parse import quote
+from backend.utils.azure_utils import get_blob_service_client, generate_read_sas
+from backend.app.services.transfer_pool import run_transfers
+from backend.config.settings import (
+    SERVER_COPY_SAS_TTL_MINUTES, SERVER_COPY_POLL_INTERVAL, SERVER_COPY_TIMEOUT
+)
+
+
+def build_source_url(account_name, account_key, filesystem, path, with_sas):
+    """
+    Returns the blob URL of a source file. Cross-account copies need a SAS
+    because the target account cannot authenticate against the source with its own key.
+    """
+    url = f"https://{account_name}.blob.core.windows.net/{filesystem}/{quote(path)}"
+    if with_sas:
+        url += "?" + generate_read_sas(account_name, account_key, filesystem, path, SERVER_COPY_SAS_TTL_MINUTES)
+    return url
+
+
+def copy_blobs(src_account, tgt_account, src_filesystem, tgt_filesystem, pairs, max_workers):
+    """
+    Copies files inside Azure Storage without routing data through this host.
+    src_account/tgt_account: dicts with 'account_name' and 'account_key'
+    pairs: iterable of (source_path, target_path), consumed lazily
+    Starts every copy, then polls the pending ones in bulk until they finish.
+    Returns (copied, failures) where copied lists the (source_path, target_path)
+    pairs of the successful copies in the order they were produced.
+    """
+    src_name, src_key = src_account["account_name"], src_account["account_key"]
+    tgt_name, tgt_key = tgt_account["account_name"], tgt_account["account_key"]
+    cross_account = src_name != tgt_name
+    container_client = get_blob_service_client(tgt_name, tgt_key).get_container_client(tgt_filesystem)
+
+    ordered = []
+
+    def start(pair):
+        src_path, tgt_path = pair
+        source_url = build_source_url(src_name, src_key, src_filesystem, src_path, cross_account)
+        blob_client = container_client.get_blob_client(tgt_path)
+        result = blob_client.start_copy_from_url(source_url)
+        return pair, blob_client, result.get("copy_status")
+
+    def poll(entry):
+        pair, blob_client = entry
+        copy = blob_client.get_blob_properties().copy
+        return pair, blob_client, copy.status, copy.status_description
+
+    def describe(entry):
+        return entry[0] if isinstance(entry[0], str) else entry[0][0]
+
+    def iter_ordered():
+        for pair in pairs:
+            ordered.append(pair)
+            yield pair
+
+    started, failures = run_transfers(iter_ordered(), start, max_workers, describe=describe)
+    succeeded = {pair for pair, _, status in started if status == "success"}
+    pending = [(pair, blob_client) for pair, blob_client, status in started if status != "success"]
+
+    deadline = time.monotonic() + SERVER_COPY_TIMEOUT
+    while pending:
+        if time.monotonic() > deadline:
+            for pair, blob_client in pending:
+                try:
+                    blob_client.abort_copy(blob_client.get_blob_properties().copy.id)
+                except Exception:
+                    pass
+                failures.append({"file": pair[0], "error": f"Server-side copy timed out after {SERVER_COPY_TIMEOUT} seconds."})
+            break
+        time.sleep(SERVER_COPY_POLL_INTERVAL)
+        polled, poll_failures = run_transfers(pending, poll, max_workers, describe=describe)
+        failures.extend(poll_failures)
+        pending = []
+        for pair, blob_client, status, description in polled:
+            if status == "success":
+                succeeded.add(pair)
+            elif status == "pending":
+                pending.append((pair, blob_client))
+            else:
+                failures.append({"file": pair[0], "error": f"Server-side copy {status}: {description}"})
+
+    return [pair for pair in ordered if pair in succeeded], failures
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import threading
+import time
+from backend.storage.checkpoint_storage import load_checkpoints, save_checkpoints
+from backend.config.settings import (
+    CHECKPOINT_INTERVAL_MB, CHECKPOINT_SAVE_INTERVAL, TRANSFER_RETRY_DELAY
+)
+
+
+def run_key_for(job):
+    """
+    Identifies one logical run of a job: the resolved source, target and mask.
+    A re-run with the same key resumes the previous attempt's checkpoint.
+    """
+    fields = ["sourceType", "sourceAzureId", "sourceContainer", "source", "sourceFileMask",
+              "targetType", "targetAzureId", "targetContainer", "target"]
+    resolved = {f: job.get(f) for f in fields}
+    if job.get("additional_targets"):
+        resolved["additional_targets"] = job["additional_targets"]
+    payload = json.dumps(resolved, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+class FileProgress:
+    """
+    Resume point of one file transfer, handed to the chunked engines.
+    offset: committed bytes of an earlier attempt (0 to start fresh)
+    interval: bytes between checkpoints
+    """
+    def __init__(self, checkpoint, source_key, target_key, fingerprint, offset):
+        self.checkpoint = checkpoint
+        self.source_key = source_key
+        self.target_key = target_key
+        self.fingerprint = fingerprint
+        self.offset = offset
+        self.interval = CHECKPOINT_INTERVAL_MB * 1024 * 1024
+
+    def record(self, offset):
+        self.offset = offset
+        self.checkpoint.record_progress(self.source_key, self.target_key, self.fingerprint, offset)
+
+
+class TransferCheckpoint:
+    """
+    Per-job, per-run record of completed files and committed byte offsets of
+    partially transferred files, so a failed run can be resumed.
+    Saved at most every CHECKPOINT_SAVE_INTERVAL seconds while the run is going,
+    and dropped once the run finishes without failures.
+    A disabled checkpoint never resumes and is never written.
+    """
+    def __init__(self, job_id, run_key, enabled):
+        self.job_id = job_id
+        self.run_key = run_key
+        self.enabled = bool(enabled and job_id)
+        checkpoints = load_checkpoints(job_id) if self.enabled else {}
+        state = checkpoints.get(run_key) or {}
+        self.completed = state.get("completed", {})
+        self.partial = state.get("partial", {})
+        self.resumed_files = []
+        self._lock = threading.Lock()
+        self._last_save = time.monotonic()
+
+    def _matches(self, entry, target_key, fingerprint):
+        return bool(entry) and entry.get("target") == target_key and entry.get("fingerprint") == fingerprint
+
+    def is_completed(self, source_key, target_key, fingerprint):
+        return self.enabled and self._matches(self.completed.get(source_key), target_key, fingerprint)
+
+    def progress_for(self, source_key, target_key, fingerprint):
+        if not self.enabled:
+            return None
+        entry = self.partial.get(source_key)
+        offset = entry.get("offset", 0) if self._matches(entry, target_key, fingerprint) else 0
+        return FileProgress(self, source_key, target_key, fingerprint, offset)
+
+    def record_progress(self, source_key, target_key, fingerprint, offset):
+        with self._lock:
+            self.partial[source_key] = {"target": target_key, "fingerprint": fingerprint, "offset": offset}
+        self._save_if_due()
+
+    def mark_completed(self, source_key, target_key, fingerprint):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.partial.pop(source_key, None)
+            self.completed[source_key] = {"target": target_key, "fingerprint": fingerprint}
+        self._save_if_due()
+
+    def run(self, source_key, target_key, fingerprint, copy, retries=0):
+        """
+        Delivers one file. Files completed by an earlier attempt of this run are not
+        copied again; otherwise copy(progress) is called, resuming from the last
+        committed offset, and retried up to retries times with growing delays.
+        Returns the result of copy(), or target_key for an already completed file.
+        """
+        if self.is_completed(source_key, target_key, fingerprint):
+            with self._lock:
+                self.resumed_files.append(source_key)
+            return target_key
+        attempt = 0
+        while True:
+            progress = self.progress_for(source_key, target_key, fingerprint)
+            try:
+                result = copy(progress)
+                break
+            except Exception:
+                if attempt >= retries:
+                    raise
+                time.sleep(TRANSFER_RETRY_DELAY * (2 ** attempt))
+                attempt += 1
+        self.mark_completed(source_key, target_key, fingerprint)
+        return result
+
+    def _save_if_due(self):
+        if time.monotonic() - self._last_save >= CHECKPOINT_SAVE_INTERVAL:
+            self.save()
+
+    def save(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            state = {"completed": dict(self.completed), "partial": dict(self.partial)}
+            self._last_save = time.monotonic()
+        checkpoints = load_checkpoints(self.job_id)
+        checkpoints[self.run_key] = state
+        save_checkpoints(self.job_id, checkpoints)
+
+    def finish(self, success):
+        """
+        Drops the run's checkpoint after a clean run, or saves it so the next attempt can resume.
+        """
+        if not self.enabled:
+            return
+        if success:
+            checkpoints = load_checkpoints(self.job_id)
+            if checkpoints.pop(self.run_key, None) is not None:
+                save_checkpoints(self.job_id, checkpoints)
+        else:
+            self.save()
@@ -0,0 +1,283 @@
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from backend.config.settings import GOVERNOR_MEMORY_BUDGET_MB, GOVERNOR_THROUGHPUT_WINDOW
+
+
+class BandwidthLimiter:
+    """
+    Token bucket shared by every job that reads from or writes to one data source.
+    rate: bytes per second; the bucket holds at most one second of tokens.
+    Waiting jobs are served fairly: the job that was granted the fewest bytes
+    goes first, and a job joining late starts level with the others instead of
+    from zero, so it cannot starve the jobs already running.
+    A chunk may overdraw the bucket; later callers then wait for it to refill.
+    """
+    def __init__(self, rate):
+        self.rate = rate
+        self._tokens = rate or 0
+        self._updated = time.monotonic()
+        self._granted = {}
+        self._waiting = []
+        self._cond = threading.Condition()
+        self._samples = deque()
+        self.bytes_total = 0
+
+    def set_rate(self, rate):
+        with self._cond:
+            self._refill()
+            self.rate = rate
+            self._tokens = min(self._tokens, rate) if rate else 0
+            self._cond.notify_all()
+
+    def join(self, lease_id):
+        with self._cond:
+            self._granted[lease_id] = min(self._granted.values(), default=0)
+
+    def leave(self, lease_id):
+        with self._cond:
+            self._granted.pop(lease_id, None)
+            self._cond.notify_all()
+
+    def _refill(self):
+        now = time.monotonic()
+        if self.rate:
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _next_waiter(self):
+        # First waiter of the least-served job
+        return min(self._waiting, key=lambda w: self._granted.get(w[0], 0))[1]
+
+    def consume(self, lease_id, nbytes):
+        """
+        Blocks until nbytes may be transferred.
+        """
+        ticket = object()
+        with self._cond:
+            self._waiting.append((lease_id, ticket))
+            try:
+                while True:
+                    self._refill()
+                    if not self.rate or (self._tokens > 0 and self._next_waiter() is ticket):
+                        self._tokens -= nbytes
+                        self._granted[lease_id] = self._granted.get(lease_id, 0) + nbytes
+                        self._record(nbytes)
+                        return
+                    timeout = None
+                    if self._next_waiter() is ticket:
+                        timeout = (-self._tokens) / self.rate + 0.001
+                    self._cond.wait(timeout)
+            finally:
+                self._waiting.remove((lease_id, ticket))
+                self._cond.notify_all()
+
+    def _record(self, nbytes):
+        now = time.monotonic()
+        self.bytes_total += nbytes
+        self._samples.append((now, nbytes))
+        while self._samples and now - self._samples[0][0] > GOVERNOR_THROUGHPUT_WINDOW:
+            self._samples.popleft()
+
+    def snapshot(self):
+        with self._cond:
+            now = time.monotonic()
+            recent = sum(n for t, n in self._samples if now - t <= GOVERNOR_THROUGHPUT_WINDOW)
+            return {
+                "rate_bytes_per_sec": self.rate or None,
+                "throughput_bytes_per_sec": recent / GOVERNOR_THROUGHPUT_WINDOW,
+                "bytes_total": self.bytes_total,
+                "active_jobs": len(self._granted),
+                "waiting": len(self._waiting),
+            }
+
+
+class MemoryBudget:
+    """
+    Process-wide cap on bytes held by chunks in flight.
+    Each active job may hold up to an equal share of the budget while others
+    are waiting, and the whole budget when it runs alone. A chunk larger than
+    the budget is let through once nothing else is in flight.
+    """
+    def __init__(self, budget):
+        self.budget = budget
+        self.in_flight = 0
+        self._held = {}
+        self._cond = threading.Condition()
+
+    def join(self, lease_id):
+        with self._cond:
+            self._held.setdefault(lease_id, 0)
+
+    def leave(self, lease_id):
+        with self._cond:
+            self._held.pop(lease_id, None)
+            self._cond.notify_all()
+
+    def _fits(self, lease_id, nbytes):
+        if self.in_flight == 0:
+            return True
+        if self.in_flight + nbytes > self.budget:
+            return False
+        held = self._held.get(lease_id, 0)
+        share = self.budget / max(1, len(self._held))
+        return held == 0 or held + nbytes <= share
+
+    def acquire(self, lease_id, nbytes):
+        with self._cond:
+            while not self._fits(lease_id, nbytes):
+                self._cond.wait()
+            self.in_flight += nbytes
+            self._held[lease_id] = self._held.get(lease_id, 0) + nbytes
+
+    def release(self, lease_id, nbytes):
+        with self._cond:
+            self.in_flight -= nbytes
+            if lease_id in self._held:
+                self._held[lease_id] -= nbytes
+            self._cond.notify_all()
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "budget_bytes": self.budget,
+                "in_flight_bytes": self.in_flight,
+                "utilisation": self.in_flight / self.budget if self.budget else 0,
+            }
+
+
+class TransferLease:
+    """
+    One running copy's handle on the governor. The chunked engines call
+    reserve() around each chunk they hold in memory and throttle() before
+    moving it, on the "source" and "target" side of the copy.
+    """
+    def __init__(self, governor, job_id, limiters):
+        self.id = str(uuid.uuid4())
+        self.job_id = job_id
+        self.started = time.time()
+        self.bytes_in_flight = 0
+        self._governor = governor
+        self._limiters = limiters
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def reserve(self, nbytes):
+        self._governor.memory.acquire(self.id, nbytes)
+        with self._lock:
+            self.bytes_in_flight += nbytes
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.bytes_in_flight -= nbytes
+            self._governor.memory.release(self.id, nbytes)
+
+    def throttle(self, side, nbytes):
+        # A fan-out copy has several targets; each one's data source is charged
+        for limiter in self._limiters.get(side, ()):
+            limiter.consume(self.id, nbytes)
+
+
+class NoLease:
+    """
+    Stand-in used when a copy runs outside the governor.
+    """
+    id = None
+
+    @contextmanager
+    def reserve(self, nbytes):
+        yield
+
+    def throttle(self, side, nbytes):
+        pass
+
+
+class TransferGovernor:
+    """
+    Shares bandwidth and memory between all copies running in this process.
+    Bandwidth is limited per data source ("bandwidth_limit_mb" in its config,
+    in MB per second; unset means unlimited), memory by GOVERNOR_MEMORY_BUDGET_MB.
+    """
+    def __init__(self, memory_budget):
+        self.memory = MemoryBudget(memory_budget)
+        self._limiters = {}
+        self._leases = {}
+        self._sides = {}
+        self._lock = threading.Lock()
+
+    def _limiter(self, source_id, rate):
+        limiter = self._limiters.get(source_id)
+        if limiter is None:
+            limiter = self._limiters[source_id] = BandwidthLimiter(rate)
+        elif limiter.rate != rate:
+            limiter.set_rate(rate)
+        return limiter
+
+    @contextmanager
+    def lease(self, job_id, data_sources):
+        """
+        Registers a running copy for the duration of the with block.
+        data_sources: {"source"/"target": [(data_source_id, config), ...]} for the Azure sides of the copy
+        """
+        with self._lock:
+            limiters = {
+                side: [self._limiter(source_id, bandwidth_limit(config)) for source_id, config in sources]
+                for side, sources in data_sources.items()
+            }
+            lease = TransferLease(self, job_id, limiters)
+            self._leases[lease.id] = lease
+            self._sides[lease.id] = {
+                side: [source_id for source_id, _ in sources] for side, sources in data_sources.items()
+            }
+        joined = {id(l): l for side_limiters in limiters.values() for l in side_limiters}.values()
+        for limiter in joined:
+            limiter.join(lease.id)
+        self.memory.join(lease.id)
+        try:
+            yield lease
+        finally:
+            self.memory.leave(lease.id)
+            for limiter in joined:
+                limiter.leave(lease.id)
+            with self._lock:
+                self._leases.pop(lease.id, None)
+                self._sides.pop(lease.id, None)
+
+    def utilisation(self):
+        with self._lock:
+            leases = list(self._leases.values())
+            sides = {lease_id: dict(s) for lease_id, s in self._sides.items()}
+            limiters = dict(self._limiters)
+        return {
+            "memory": self.memory.snapshot(),
+            "bandwidth": {source_id: limiter.snapshot() for source_id, limiter in limiters.items()},
+            "jobs": [
+                {
+                    "lease_id": lease.id,
+                    "job_id": lease.job_id,
+                    "started": lease.started,
+                    "bytes_in_flight": lease.bytes_in_flight,
+                    "data_sources": sides.get(lease.id, {}),
+                }
+                for lease in leases
+            ],
+        }
+
+
+def bandwidth_limit(config):
+    """
+    Bytes per second allowed for a data source, or None when unlimited.
+    """
+    value = (config or {}).get("bandwidth_limit_mb")
+    try:
+        rate = float(value) if value else 0
+    except (TypeError, ValueError):
+        rate = 0
+    return int(rate * 1024 * 1024) if rate > 0 else None
+
+
+NO_LEASE = NoLease()
+governor = TransferGovernor(GOVERNOR_MEMORY_BUDGET_MB * 1024 * 1024)
@@ -0,0 +1,74 @@
+import os
+import threading
+from datetime import datetime
+from backend.storage.transfer_manifest_storage import load_manifest, save_manifest
+
+
+def local_fingerprint(path_or_entry):
+    # An os.DirEntry reuses the stat information gathered while listing the directory
+    st = path_or_entry.stat() if isinstance(path_or_entry, os.DirEntry) else os.stat(path_or_entry)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def adls_fingerprint(path_properties):
+    last_modified = path_properties.last_modified
+    return {
+        "size": path_properties.content_length,
+        "etag": path_properties.etag,
+        "last_modified": last_modified.isoformat() if hasattr(last_modified, "isoformat") else last_modified,
+    }
+
+
+class TransferManifest:
+    """
+    Per-job record of what was last delivered, used by incremental copies.
+    Maps a source file to the target it was copied to and the source fingerprint
+    (size/mtime for local files, size/ETag/last-modified for Azure files) at that time.
+    A disabled manifest never skips anything and is never written.
+    """
+    def __init__(self, job_id, enabled):
+        self.job_id = job_id
+        self.enabled = bool(enabled and job_id)
+        self.entries = load_manifest(job_id) if self.enabled else {}
+        self.skipped_files = []
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def is_unchanged(self, source_key, target_key, fingerprint):
+        if not self.enabled:
+            return False
+        entry = self.entries.get(source_key)
+        return bool(entry) and entry.get("target") == target_key and entry.get("fingerprint") == fingerprint
+
+    def record(self, source_key, target_key, fingerprint):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.entries[source_key] = {
+                "target": target_key,
+                "fingerprint": fingerprint,
+                "copied_at": datetime.utcnow().isoformat(),
+            }
+            self._dirty = True
+
+    def skip(self, source_key):
+        with self._lock:
+            self.skipped_files.append(source_key)
+
+    def transfer(self, source_key, target_key, fingerprint, copy, target_exists=True):
+        """
+        Runs copy() unless source_key was already delivered to target_key with the same fingerprint.
+        Pass target_exists=False when the target is known to be missing to force the copy.
+        Returns copy()'s result, or None if the file was skipped.
+        """
+        if target_exists and self.is_unchanged(source_key, target_key, fingerprint):
+            self.skip(source_key)
+            return None
+        result = copy()
+        self.record(source_key, target_key, fingerprint)
+        return result
+
+    def save(self):
+        if self.enabled and self._dirty:
+            save_manifest(self.job_id, self.entries)
+            self._dirty = False
@@ -0,0 +1,121 @@
+import concurrent.futures
+import queue
+import threading
+from backend.config.settings import COPY_MAX_WORKERS, COPY_MAX_WORKERS_LIMIT, LISTING_QUEUE_SIZE
+
+_DONE = object()
+
+
+class PartialCopyError(Exception):
+    """
+    Raised when some files of a batch could not be copied.
+    Carries the files that did make it so the run record stays accurate.
+    """
+    def __init__(self, message, copied_files, source_files, failed_files):
+        super().__init__(message)
+        self.copied_files = copied_files
+        self.source_files = source_files
+        self.failed_files = failed_files
+
+
+def resolve_max_workers(requested=None):
+    """
+    Returns the number of concurrent file transfers to use for a job.
+    Falls back to COPY_MAX_WORKERS and never exceeds COPY_MAX_WORKERS_LIMIT.
+    """
+    try:
+        workers = int(requested) if requested else COPY_MAX_WORKERS
+    except (TypeError, ValueError):
+        workers = COPY_MAX_WORKERS
+    return max(1, min(workers, COPY_MAX_WORKERS_LIMIT))
+
+
+def prefetch(items, maxsize=LISTING_QUEUE_SIZE):
+    """
+    Iterates items on a background thread and yields them through a bounded queue.
+    Lets a slow producer (paged Azure listings, network share walks) keep listing
+    while the transfer workers are busy, so a job takes roughly
+    max(listing, transfer) instead of their sum. Producer errors are re-raised here.
+    """
+    buffer = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    error = []
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put(item):
+                    return
+        except Exception as e:
+            error.append(e)
+        put(_DONE)
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            item = buffer.get()
+            if item is _DONE:
+                break
+            yield item
+    finally:
+        stop.set()
+        producer.join()
+    if error:
+        raise error[0]
+
+def run_transfers(items, transfer, max_workers, describe=str):
+    """
+    Calls transfer(item) for every item using a bounded thread pool.
+    items may be any iterable; it is consumed lazily so that at most
+    2 * max_workers transfers are queued at any time.
+    Returns (results, failures):
+      results: transfer return values in the order the items were produced
+               (failed items and items whose transfer returned None are left out)
+      failures: list of {"file": describe(item), "error": str(exc)}
+    """
+    results = {}
+    failures = []
+
+    def collect(done, pending):
+        for future in done:
+            index, item = pending.pop(future)
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                failures.append({"file": describe(item), "error": str(e)})
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        for index, item in enumerate(items):
+            if len(pending) >= max_workers * 2:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                collect(done, pending)
+            pending[executor.submit(transfer, item)] = (index, item)
+        if pending:
+            done, _ = concurrent.futures.wait(pending)
+            collect(done, pending)
+
+    return [results[i] for i in sorted(results) if results[i] is not None], failures
+
+
+def raise_for_failures(copied_files, source_files, failures):
+    """
+    Raises PartialCopyError if any file of the batch failed.
+    """
+    if failures:
+        raise PartialCopyError(
+            f"{len(failures)} of {len(source_files)} files failed to copy.",
+            copied_files,
+            source_files,
+            failures,
+        )
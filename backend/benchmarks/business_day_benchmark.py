@@ -0,0 +1,92 @@
+"""
+Compares the precomputed business-day calendar used by the scheduler with the
+day-by-day scan it replaced, resolving the target day of many custom schedules.
+
+Usage (from the repository root):
+    python -m backend.benchmarks.business_day_benchmark --schedules 5000
+
+Both methods use the same holiday set and must agree on every target; the
+calendar's one-off cost of building a year's table is reported separately.
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+
+import holidays
+
+from backend.utils.business_calendar import BusinessCalendar
+
+PERIODS = {"month": (None, 1), "quarter": (4, 3), "halfyear": (2, 6), "annually": (1, 12)}
+
+
+def scan_nth_business_day(holiday_set, year, first_month, months, n):
+    # The scheduler's previous approach: try every day of the period in turn
+    count = 0
+    for m in range(first_month, first_month + months):
+        for day in range(1, 32):
+            try:
+                d = datetime(year, m, day)
+            except ValueError:
+                break
+            if d.weekday() < 5 and d.date() not in holiday_set:
+                count += 1
+                if count == n:
+                    return d.date()
+    return None
+
+
+def make_schedules(count, year, seed):
+    rng = random.Random(seed)
+    schedules = []
+    for _ in range(count):
+        period = rng.choice(list(PERIODS))
+        periods, months = PERIODS[period]
+        index = rng.randint(1, periods) if periods else rng.randint(1, 12)
+        first_month = (index - 1) * months + 1
+        schedules.append((year, first_month, months, rng.randint(1, 20 * months)))
+    return schedules
+
+
+def timed(func, schedules):
+    start = time.perf_counter()
+    results = [func(*schedule) for schedule in schedules]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schedules", type=int, default=5000, help="Custom schedules to resolve")
+    parser.add_argument("--year", type=int, default=datetime.now().year, help="Year the schedules fall in")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per method; the best run is reported")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the random schedules")
+    args = parser.parse_args()
+
+    holiday_set = holidays.country_holidays("GB", subdiv="England", years=args.year)
+    schedules = make_schedules(args.schedules, args.year, args.seed)
+    calendar = BusinessCalendar(lambda year: holiday_set)
+
+    start = time.perf_counter()
+    calendar.business_days_in(args.year, 1, 12)
+    print(f"{'table build':<16} {time.perf_counter() - start:8.4f} s  (once per year)")
+
+    methods = (
+        ("day-by-day scan", lambda *s: scan_nth_business_day(holiday_set, *s)),
+        ("calendar", calendar.nth_business_day),
+    )
+    results = {}
+    for name, func in methods:
+        best = None
+        for _ in range(args.repeat):
+            elapsed, answers = timed(func, schedules)
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = (best, answers)
+        print(f"{name:<16} {best:8.4f} s  {best / len(schedules) * 1e6:8.2f} us per schedule")
+
+    if results["day-by-day scan"][1] != results["calendar"][1]:
+        raise SystemExit("Calendar and scan disagree on some targets")
+    print(f"Speed-up of the calendar over the scan: {results['day-by-day scan'][0] / results['calendar'][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
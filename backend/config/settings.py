@@ -1,4 +1,43 @@
 # Configuration settings for the file mover tool
-SCHEDULER_INTERVAL = 60  # Interval for the scheduler in seconds
+SCHEDULER_INTERVAL = 60  # Longest the scheduler sleeps before re-reading schedules, picking up edits made outside the API
+SCHEDULER_MISFIRE_GRACE = 300  # Seconds a scheduled run may start late (e.g. after the host slept); later ones are skipped
+SCHEDULER_PREVIEW_MAX = 100  # Most fire times returned by the schedule preview endpoints
+DEFAULT_HOLIDAY_CALENDAR = "GB-England"  # Business days of schedules without a "calendar": "CC" or "CC-subdivision", or a market like "ECB"
 # Security settings
 ENCRYPTION_KEY = "kQv3w7l9v8QvK5gkK8kQvK5gkK8kQvK5gkK8kQvK5gk="  # Key for encrypting credentials
+
+# Copy engine settings
+COPY_MAX_WORKERS = 8  # Default number of files transferred concurrently per job
+COPY_MAX_WORKERS_LIMIT = 64  # Upper bound for a job's max_parallel_files
+COPY_CHUNK_SIZE_MB = 8  # Default chunk size for streamed transfers; bounds memory per file
+SERVER_COPY_SAS_TTL_MINUTES = 60  # Lifetime of the read SAS used for cross-account server-side copies
+SERVER_COPY_POLL_INTERVAL = 2  # Seconds between copy status polls
+SERVER_COPY_TIMEOUT = 6 * 60 * 60  # Seconds before pending server-side copies are aborted
+ADLS_CLIENT_TTL_SECONDS = 30 * 60  # How long a validated Azure service client is reused
+ADLS_CLIENT_CACHE_SIZE = 32  # Maximum number of cached Azure service clients
+LISTING_QUEUE_SIZE = 10000  # Source entries listed ahead of the transfer workers
+# Large files are split into ranges copied concurrently; data sources can override these
+# with "parallel_threshold_mb", "parallel_chunk_size_mb" and "parallel_concurrency" in their config
+LARGE_FILE_THRESHOLD_MB = 256  # Files of at least this size use the parallel range engine
+LARGE_FILE_CHUNK_SIZE_MB = 32  # Range size for large files
+LARGE_FILE_CONCURRENCY = 8  # Ranges of one file in flight at once
+CHECKPOINT_INTERVAL_MB = 256  # Bytes of a file transferred between resumable checkpoints
+CHECKPOINT_SAVE_INTERVAL = 5  # Seconds between writes of a running job's checkpoint file
+TRANSFER_RETRY_DELAY = 5  # Seconds before the first retry of a failed file; doubles per attempt
+# Process-wide transfer governor; per data source bandwidth is set with "bandwidth_limit_mb" (MB/s) in its config
+GOVERNOR_MEMORY_BUDGET_MB = 1024  # Bytes of file data held in memory by all running copies together
+GOVERNOR_THROUGHPUT_WINDOW = 10  # Seconds over which reported throughput is averaged
+# Storage of jobs, data sources, schedules and global variables: "json" files or "sqlite"
+STORAGE_BACKEND = "json"
+SQLITE_DB_FILE = "backend/data/copypilot.db"  # Used by the sqlite backend; JSON files are imported on first use
+# Run history retention, applied by the background compactor; jobs can override these in their "retention" settings
+RUN_HISTORY_KEEP_RUNS = 500  # Runs kept in a job's history; older ones move to the compressed archive
+RUN_HISTORY_KEEP_DAYS = 90  # Runs older than this move to the archive; the newest run is always kept
+RUN_HISTORY_DETAIL_DAYS = 7  # Runs older than this keep their counts but move file lists and date runs to the archive
+RUN_HISTORY_COMPACT_INTERVAL = 6 * 60 * 60  # Seconds between compaction passes
+# Job executor: runs started by the API and the scheduler wait in a priority queue (manual > scheduled > backfill)
+JOB_EXECUTOR_WORKERS = 4  # Jobs run at once; each job still copies its files in parallel
+JOB_QUEUE_MAX = 1000  # Waiting runs beyond this are refused until the queue drains
+JOB_QUEUE_FILE = "backend/data/job_queue.json"  # Waiting and running runs, restored on restart
+JOB_WAIT_SAMPLES = 1000  # Recent queue wait times kept for the executor metrics
+DATA_SOURCE_MAX_CONCURRENT_JOBS = None  # Jobs using one data source at once; "max_concurrent_jobs" in its config overrides; None is unlimited
@@ -5,8 +5,12 @@ from backend.app.api.datasources import router as datasources_router
 from backend.app.api.global_variables import router as global_vars_router
 from backend.app.api.local_variables import router as local_vars_router
 from backend.app.api.scheduler import router as schedules_router
+from backend.app.api.transfers import router as transfers_router
+from backend.app.api.executor import router as executor_router
 from backend.app.services.scheduler_runner import start_scheduler
+from backend.app.services.job_executor import start_job_executor
 from backend.app.services.global_variable_refresher import start_global_variable_refresher
+from backend.app.services.run_history_compactor import start_run_history_compactor
 
 app = FastAPI()
 # Initialize the app with the router
@@ -16,8 +20,12 @@ app.include_router(datasources_router)
 app.include_router(global_vars_router)
 app.include_router(local_vars_router)
 app.include_router(schedules_router)
+app.include_router(transfers_router)
+app.include_router(executor_router)
 
+start_job_executor()
 start_scheduler()
 start_global_variable_refresher()
+start_run_history_compactor()
 
 
@@ -7,6 +7,31 @@ class TimeTravelConfig(BaseModel):
     from_date: Optional[str] = None  # Format: "YYYY-MM-DD"
     to_date: Optional[str] = None    # Format: "YYYY-MM-DD"
 
+class TransferConfig(BaseModel):
+    max_parallel_files: Optional[int] = None  # Files copied concurrently; None uses COPY_MAX_WORKERS
+    chunk_size_mb: Optional[float] = None  # Streaming chunk size; None uses COPY_CHUNK_SIZE_MB
+    copy_mode: Optional[str] = "auto"  # "auto"/"server": server-side copy for Azure to Azure, "stream": through this host
+    incremental: bool = False  # Skip files whose source fingerprint matches the last delivered copy
+    operation: Optional[str] = "copy"  # "copy" or "move" (move is supported between local and shared folders)
+    recursive: bool = False  # Include subdirectories of local/shared sources, keeping their layout
+    max_depth: Optional[int] = None  # Subdirectory levels to descend when recursive; None is unlimited
+    exclude_dirs: List[str] = Field(default_factory=list)  # fnmatch patterns of subdirectory names to skip
+    resumable: bool = True  # Checkpoint progress so a failed run resumes instead of starting over
+    retries: int = 0  # Extra attempts per failed file, each resuming from its last checkpoint
+    verify: Optional[str] = "store"  # "off", "store" (MD5 while streaming, stored on the target), "metadata" (also checked against the source's Content-MD5) or "reread" (also checked against a re-read of the target)
+
+class RetentionConfig(BaseModel):
+    keep_runs: Optional[int] = None  # Runs kept in the history; None uses RUN_HISTORY_KEEP_RUNS
+    keep_days: Optional[int] = None  # Age in days after which runs are archived; None uses RUN_HISTORY_KEEP_DAYS
+    detail_days: Optional[int] = None  # Age in days after which file lists are archived; None uses RUN_HISTORY_DETAIL_DAYS
+
+class AdditionalTarget(BaseModel):
+    # Another destination of a fan-out job; same meaning as the job's own target fields
+    targetType: str
+    targetAzureId: Optional[str] = None
+    targetContainer: Optional[str] = None
+    target: str
+
 class CopyJob(BaseModel):
     id: Optional[str] = Field(default_factory=lambda: str(uuid.uuid4()))
     name: str
@@ -22,6 +47,9 @@ class CopyJob(BaseModel):
     targetFileMask: Optional[str] = None
     local_variables: List[Dict[str, Any]] = Field(default_factory=list)
     time_travel: Optional[TimeTravelConfig] = Field(default_factory=TimeTravelConfig)
+    transfer: Optional[TransferConfig] = Field(default_factory=TransferConfig)
+    additional_targets: List[AdditionalTarget] = Field(default_factory=list)  # Each source file is read once and delivered to all targets
+    retention: Optional[RetentionConfig] = Field(default_factory=RetentionConfig)
     created_by: Optional[str] = None
     updated_by: Optional[str] = None
     created_on: Optional[str] = None  # ISO format string
@@ -15,10 +15,13 @@ class AdlsStorageAdapter:
         source_file_system, source_file = self._parse_path(source_path)
         target_file_system, target_file = self._parse_path(target_path)
 
-        source_file_client = self.service_client.get_file_system_client(source_file_system).get_file_client(source_file)
-        target_file_client = self.service_client.get_file_system_client(target_file_system).get_file_client(target_file)
+        # Data Lake file clients have no copy API, so the copy is started through the blob endpoint
+        from backend.utils.azure_utils import get_blob_service_client
+        blob_service_client = get_blob_service_client(self.account_name, self.account_key)
+        source_blob_client = blob_service_client.get_blob_client(source_file_system, source_file)
+        target_blob_client = blob_service_client.get_blob_client(target_file_system, target_file)
 
-        target_file_client.start_copy_from_url(source_file_client.url)
+        target_blob_client.start_copy_from_url(source_blob_client.url)
 
     def move_file(self, source_path, target_path):
         self.copy_file(source_path, target_path)
@@ -0,0 +1,25 @@
+import os
+import json
+from filelock import FileLock
+
+CHECKPOINT_DIR = "backend/data/checkpoints"
+
+def load_checkpoints(job_id):
+    checkpoint_file = os.path.join(CHECKPOINT_DIR, f"checkpoint_{job_id}.json")
+    if os.path.exists(checkpoint_file):
+        with open(checkpoint_file, "r") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return {}
+    return {}
+
+def save_checkpoints(job_id, checkpoints):
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    checkpoint_file = os.path.join(CHECKPOINT_DIR, f"checkpoint_{job_id}.json")
+    with FileLock(checkpoint_file + ".lock"):
+        if checkpoints:
+            with open(checkpoint_file, "w") as f:
+                json.dump(checkpoints, f)
+        elif os.path.exists(checkpoint_file):
+            os.remove(checkpoint_file)
@@ -1,14 +1,13 @@
-import os
 import json
-from filelock import FileLock
+from backend.storage.document_store import get_collection
 
 DATA_SOURCE_FILE = "backend/data/data_sources.json"
 
+def _data_sources():
+    return get_collection("data_sources", DATA_SOURCE_FILE)
+
 def load_data_sources():
-    if not os.path.exists(DATA_SOURCE_FILE):
-        return []
-    with open(DATA_SOURCE_FILE, "r") as f:
-        data_sources = json.load(f)
+    data_sources = _data_sources().load()
     # Migrate any string configs to dicts
     updated = False
     for ds in data_sources:
@@ -24,23 +23,17 @@ def load_data_sources():
     return data_sources
 
 def save_data_sources(data_sources):
-    with FileLock(DATA_SOURCE_FILE+".lock"):
-        with open(DATA_SOURCE_FILE, "w") as f:
-            json.dump(data_sources, f, indent=2)
-        
-        
+    _data_sources().save(data_sources)
+
+
 def load_data_source_by_name(name):
-    with open(DATA_SOURCE_FILE, "r") as f:
-        sources = json.load(f)
-    for src in sources:
-        if src["name"] == name:
-            return src
-    raise ValueError(f"Data source '{name}' not found.")
+    src = _data_sources().get("name", name)
+    if src is None:
+        raise ValueError(f"Data source '{name}' not found.")
+    return src
 
 def load_data_source_by_id(id):
-    with open(DATA_SOURCE_FILE, "r") as f:
-        sources = json.load(f)
-    for src in sources:
-        if str(src["id"]) == str(id):
-            return src
-    raise ValueError(f"Data source with id '{id}' not found.")
\ No newline at end of file
+    src = _data_sources().get("id", id)
+    if src is None:
+        raise ValueError(f"Data source with id '{id}' not found.")
+    return src
\ No newline at end of file
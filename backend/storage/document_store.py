@@ -0,0 +1,177 @@
+import os
+import json
+import sqlite3
+import threading
+from backend.config.settings import STORAGE_BACKEND, SQLITE_DB_FILE
+from backend.storage.json_cache import load_json, save_json, find_json
+
+# Jobs, data sources, schedules and global variables are each stored as a
+# collection of records (dicts, keyed by their "id"). The *_storage modules keep
+# their load_*/save_* functions and delegate to the collection returned by
+# get_collection, so the backend is chosen in one place (STORAGE_BACKEND):
+#   "json":   one JSON file per collection, rewritten under a FileLock on save and
+#             served from the json_cache while the file is unchanged
+#   "sqlite": one row per record in SQLITE_DB_FILE, indexed by id and name,
+#             in WAL mode so readers never wait for a writer
+
+class JsonCollection:
+    def __init__(self, name, json_file):
+        self.name = name
+        self.json_file = json_file
+
+    def load(self):
+        return load_json(self.json_file, default=[])
+
+    def save(self, records):
+        save_json(self.json_file, records)
+
+    def get(self, field, value):
+        return find_json(self.json_file, field, value)
+
+
+class SqliteDatabase:
+    """
+    Shared SQLite file holding every collection; one connection per thread.
+    """
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+
+    def connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_file, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._ensure_schema(conn)
+        return conn
+
+    def _ensure_schema(self, conn):
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS records ("
+                    " collection TEXT NOT NULL, id TEXT NOT NULL, name TEXT,"
+                    " position INTEGER NOT NULL, body TEXT NOT NULL,"
+                    " PRIMARY KEY (collection, id))"
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS records_by_name ON records (collection, name)")
+                conn.execute("CREATE INDEX IF NOT EXISTS records_by_position ON records (collection, position)")
+                conn.execute("CREATE TABLE IF NOT EXISTS imported (collection TEXT PRIMARY KEY, source TEXT, imported_at TEXT)")
+            self._schema_ready = True
+
+
+class SqliteCollection:
+    """
+    A collection stored as rows of the shared SQLite database. Saving a list
+    writes only the records that changed. The first time a collection is used
+    it is imported from its JSON file (see migrate_json_collection).
+    """
+    def __init__(self, name, json_file, database):
+        self.name = name
+        self.json_file = json_file
+        self.database = database
+        self._imported = False
+
+    def _conn(self):
+        conn = self.database.connection()
+        if not self._imported:
+            migrate_json_collection(conn, self.name, self.json_file)
+            self._imported = True
+        return conn
+
+    def load(self):
+        rows = self._conn().execute(
+            "SELECT body FROM records WHERE collection = ? ORDER BY position", (self.name,)
+        ).fetchall()
+        return [json.loads(body) for (body,) in rows]
+
+    def save(self, records):
+        conn = self._conn()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = dict(conn.execute(
+                "SELECT id, body || '|' || position FROM records WHERE collection = ?", (self.name,)
+            ).fetchall())
+            keep = set()
+            for position, record in enumerate(records):
+                record_id = _record_id(record, position)
+                body = json.dumps(record)
+                keep.add(record_id)
+                if existing.get(record_id) == f"{body}|{position}":
+                    continue
+                conn.execute(
+                    "INSERT OR REPLACE INTO records (collection, id, name, position, body) VALUES (?, ?, ?, ?, ?)",
+                    (self.name, record_id, record.get("name"), position, body),
+                )
+            stale = [(self.name, record_id) for record_id in existing if record_id not in keep]
+            conn.executemany("DELETE FROM records WHERE collection = ? AND id = ?", stale)
+
+    def get(self, field, value):
+        if field not in ("id", "name"):
+            return next((r for r in self.load() if str(r.get(field)) == str(value)), None)
+        row = self._conn().execute(
+            f"SELECT body FROM records WHERE collection = ? AND {field} = ? ORDER BY position LIMIT 1",
+            (self.name, str(value)),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+
+def _record_id(record, position):
+    # Records without an id are keyed by their position
+    return str(record["id"]) if record.get("id") is not None else f"#{position}"
+
+
+def migrate_json_collection(conn, name, json_file, force=False):
+    """
+    One-shot import of a collection's JSON file into SQLite. Runs once per
+    collection (recorded in the imported table) unless force is set; the JSON
+    file is left in place as a backup. Returns the number of records imported,
+    or None if the collection had already been imported.
+    """
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if not force and conn.execute("SELECT 1 FROM imported WHERE collection = ?", (name,)).fetchone():
+            return None
+        records = JsonCollection(name, json_file).load()
+        conn.execute("DELETE FROM records WHERE collection = ?", (name,))
+        conn.executemany(
+            "INSERT OR REPLACE INTO records (collection, id, name, position, body) VALUES (?, ?, ?, ?, ?)",
+            [(name, _record_id(r, i), r.get("name"), i, json.dumps(r)) for i, r in enumerate(records)],
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO imported (collection, source, imported_at) VALUES (?, ?, datetime('now'))",
+            (name, json_file),
+        )
+    return len(records)
+
+
+_database = None
+_collections = {}
+_collections_lock = threading.Lock()
+
+def get_collection(name, json_file):
+    """
+    Returns the store for a collection under the configured STORAGE_BACKEND.
+    json_file: the collection's JSON file (its storage for "json", imported once for "sqlite")
+    """
+    global _database
+    with _collections_lock:
+        collection = _collections.get(name)
+        if collection is None:
+            if STORAGE_BACKEND == "sqlite":
+                if _database is None:
+                    _database = SqliteDatabase(SQLITE_DB_FILE)
+                collection = SqliteCollection(name, json_file, _database)
+            elif STORAGE_BACKEND == "json":
+                collection = JsonCollection(name, json_file)
+            else:
+                raise ValueError(f"Unknown storage backend '{STORAGE_BACKEND}'. Expected 'json' or 'sqlite'.")
+            _collections[name] = collection
+        return collection
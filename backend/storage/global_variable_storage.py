@@ -1,16 +1,12 @@
-import json
-import os
-from filelock import FileLock
+from backend.storage.document_store import get_collection
 
 FILE = "backend/data/global_variables.json"
 
+def _variables():
+    return get_collection("global_variables", FILE)
+
 def load_global_variables():
-    if not os.path.exists(FILE):
-        return []
-    with open(FILE, "r") as f:
-        return json.load(f)
+    return _variables().load()
 
 def save_global_variables(vars):
-    with FileLock(FILE + ".lock"):
-        with open(FILE, "w") as f:
-            json.dump(vars, f, indent=2)
\ No newline at end of file
+    _variables().save(vars)
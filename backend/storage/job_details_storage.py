@@ -1,19 +1,18 @@
-import os
-import json
-from filelock import FileLock
+from backend.storage.document_store import get_collection
 
 JOBS_FILE = "backend/data/job_details.json"
 
+def _jobs():
+    return get_collection("jobs", JOBS_FILE)
+
 def load_jobs():
-    if os.path.exists(JOBS_FILE):
-        with open(JOBS_FILE, "r") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
-    return []
+    return _jobs().load()
 
 def save_jobs(jobs):
-    with FileLock(JOBS_FILE + ".lock"):
-        with open(JOBS_FILE, "w") as f:
-            json.dump(jobs, f, indent=2)
\ No newline at end of file
+    _jobs().save(jobs)
+
+def load_job_by_id(job_id):
+    """
+    Returns the job with the given id, or None.
+    """
+    return _jobs().get("id", job_id)
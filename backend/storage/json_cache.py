@@ -0,0 +1,109 @@
+import os
+import json
+import pickle
+import threading
+from filelock import FileLock
+
+# Parsed JSON documents kept in memory, keyed by path. An entry is reused while the
+# file's (inode, size, mtime, ctime) is unchanged, so a read costs one stat instead
+# of opening and parsing the file; writes made through save_json update the entry
+# directly. Callers always get their own copy, so changing a loaded document never
+# touches the cache: documents are kept pickled, which unpickles faster than a
+# recursive copy, and find_json copies only the record it returns.
+
+class _Entry:
+    def __init__(self, signature, document):
+        self.signature = signature
+        self.document = document
+        self.snapshot = pickle.dumps(document, protocol=pickle.HIGHEST_PROTOCOL)
+        self.indexes = {}
+
+    def find(self, field, value):
+        # Index of a list of records by one field, built on first use
+        index = self.indexes.get(field)
+        if index is None:
+            index = {}
+            for record in self.document if isinstance(self.document, list) else []:
+                if isinstance(record, dict):
+                    index.setdefault(str(record.get(field)), record)
+            self.indexes[field] = index
+        return index.get(str(value))
+
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+def _signature(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns, st.st_ctime_ns)
+
+def _entry(path):
+    # Returns the current cache entry for path, reading the file if it changed; None if unreadable
+    signature = _signature(path)
+    if signature is None:
+        return None
+    with _cache_lock:
+        entry = _cache.get(path)
+    if entry and entry.signature == signature:
+        return entry
+    try:
+        with open(path, "r") as f:
+            document = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    entry = _Entry(signature, document)
+    # Only cache if the file did not change while it was being read
+    if _signature(path) == signature:
+        with _cache_lock:
+            _cache[path] = entry
+    return entry
+
+def load_json(path, default=None):
+    """
+    Returns a copy of the parsed document at path, or default if the file is
+    missing or not valid JSON.
+    """
+    entry = _entry(path)
+    if entry is None:
+        return pickle.loads(pickle.dumps(default))
+    return pickle.loads(entry.snapshot)
+
+def find_json(path, field, value):
+    """
+    Returns a copy of the first record of the list at path whose field equals
+    value (compared as strings), or None.
+    """
+    entry = _entry(path)
+    if entry is None:
+        return None
+    with _cache_lock:
+        record = entry.find(field, value)
+    return pickle.loads(pickle.dumps(record)) if record is not None else None
+
+def save_json(path, document, indent=2):
+    """
+    Writes document to path under its FileLock, replacing the file atomically so
+    readers never see it half written, and updates the cache.
+    """
+    entry = _Entry(None, pickle.loads(pickle.dumps(document)))
+    with FileLock(path + ".lock"):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry.document, f, indent=indent)
+        os.replace(tmp_path, path)
+        entry.signature = _signature(path)
+        with _cache_lock:
+            _cache[path] = entry
+
+def invalidate_json(path=None):
+    """
+    Drops the cached document for path, or every cached document if path is None.
+    """
+    with _cache_lock:
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(path, None)
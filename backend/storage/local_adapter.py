@@ -1,17 +1,17 @@
 import os
-import shutil
+from backend.utils.fast_copy import fast_copy_file, move_file
 class LocalStorageAdapter:
     
 
     def copy_file(self, source: str, destination: str) -> None:
         if not os.path.exists(source):
             raise FileNotFoundError(f"Source file '{source}' does not exist.")
-        shutil.copy2(source, destination)
+        fast_copy_file(source, destination)
 
     def move_file(self, source: str, destination: str) -> None:
         if not os.path.exists(source):
             raise FileNotFoundError(f"Source file '{source}' does not exist.")
-        shutil.move(source, destination)
+        move_file(source, destination)
 
     def list_files(self, directory: str) -> list:
         if not os.path.isdir(directory):
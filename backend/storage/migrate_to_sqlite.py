@@ -0,0 +1,36 @@
+"""
+One-shot migration of the JSON stores into the SQLite database.
+
+    python -m backend.storage.migrate_to_sqlite [--force]
+
+Imports jobs, data sources, schedules and global variables into SQLITE_DB_FILE.
+Collections already imported are left alone unless --force is given. The JSON
+files are kept as a backup. Set STORAGE_BACKEND = "sqlite" afterwards; the
+sqlite backend also imports any collection it has not seen on first use.
+"""
+import argparse
+from backend.config.settings import SQLITE_DB_FILE
+from backend.storage.document_store import SqliteDatabase, migrate_json_collection
+from backend.storage.job_details_storage import JOBS_FILE
+from backend.storage.data_source_storage import DATA_SOURCE_FILE
+from backend.storage.schedule_storage import SCHEDULE_FILE
+from backend.storage.global_variable_storage import FILE as GLOBAL_VARIABLES_FILE
+
+COLLECTIONS = {
+    "jobs": JOBS_FILE,
+    "data_sources": DATA_SOURCE_FILE,
+    "schedules": SCHEDULE_FILE,
+    "global_variables": GLOBAL_VARIABLES_FILE,
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Import the JSON stores into SQLite.")
+    parser.add_argument("--force", action="store_true", help="re-import collections that were already imported")
+    args = parser.parse_args()
+    conn = SqliteDatabase(SQLITE_DB_FILE).connection()
+    for name, json_file in COLLECTIONS.items():
+        count = migrate_json_collection(conn, name, json_file, force=args.force)
+        print(f"{name}: already imported" if count is None else f"{name}: {count} records imported from {json_file}")
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,407 @@
+import gzip
 import json
 import os
-from datetime import datetime
+import threading
+import uuid
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, timezone
 from filelock import FileLock
+from backend.storage.json_cache import load_json, save_json, invalidate_json
+
+RUN_HISTORY_DIR = "backend/data/run_history"
+# Compressed segments of runs (or run details) removed from the log by compaction
+RUN_ARCHIVE_DIR = os.path.join(RUN_HISTORY_DIR, "archive")
+
+# Run history is an append-only JSON Lines log per job; every write appends one event:
+#   {"op": "put", "seq": n, "record": {...}}            a run record, replacing any earlier one with its run_id
+#   {"op": "merge", "run_id": "...", "fields": {...}}    fields merged into an existing run record
+# Readers fold the events in order. A put moves its run to the end of the history,
+# a merge keeps its place, matching the old rewrite-the-whole-file behaviour.
+# A put's seq is its place in the history; it is kept when compaction rewrites the
+# log, so cursors handed out before a compaction still point at the same run.
+# An in-memory index maps each run_id to the offsets of its events since its last put,
+# its place in the history and the fields runs are filtered by. It is extended from the
+# last indexed offset on each access and rebuilt when the log is rewritten, so a page of
+# history costs reads of that page's events only.
+
+# Fields kept in the index for filtering
+INDEXED_FIELDS = ("status", "trigger_type", "scheduler_id", "timestamp")
+
+class _HistoryIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset(None)
+
+    def reset(self, inode):
+        self.inode = inode
+        self.size = 0
+        self.offsets = {}
+        self.positions = {}  # run_id -> sequence number of its last put; higher is newer
+        self.order = []  # positions of all puts, ascending; those since replaced by a later put are skipped
+        self.run_at = {}  # position of each run's last put -> run_id
+        self.fields = {}
+        self.next_position = 0
+
+    def add(self, event, offset):
+        run_id = _run_id_of(event)
+        if event.get("op") == "put":
+            record = event.get("record") or {}
+            # Puts written before seq existed follow the previous position
+            seq = event.get("seq")
+            position = max(seq, self.next_position) if isinstance(seq, int) else self.next_position
+            self.run_at.pop(self.positions.get(run_id), None)
+            self.offsets[run_id] = [offset]
+            self.positions[run_id] = position
+            self.run_at[position] = run_id
+            self.order.append(position)
+            self.next_position = position + 1
+            self.fields[run_id] = {f: record.get(f) for f in INDEXED_FIELDS}
+        elif event.get("op") == "merge" and run_id in self.positions:
+            self.offsets[run_id].append(offset)
+            changes = event.get("fields") or {}
+            self.fields[run_id].update({f: changes[f] for f in INDEXED_FIELDS if f in changes})
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+def _history_file(job_id):
+    return os.path.join(RUN_HISTORY_DIR, f"run_history_{job_id}.jsonl")
+
+def _latest_run_file(job_id):
+    # Summary of the job's latest run, rewritten with every event appended to its log
+    return os.path.join(RUN_HISTORY_DIR, f"latest_run_{job_id}.json")
+
+def _legacy_history_file(job_id):
+    return os.path.join(RUN_HISTORY_DIR, f"run_history_{job_id}.json")
+
+def _event_line(event):
+    return (json.dumps(event) + "\n").encode("utf-8")
+
+def _run_id_of(event):
+    if event.get("op") == "put":
+        return (event.get("record") or {}).get("run_id")
+    return event.get("run_id")
+
+def _fold(events):
+    records = {}
+    for event in events:
+        if event.get("op") == "put":
+            record = event.get("record") or {}
+            records.pop(record.get("run_id"), None)
+            records[record.get("run_id")] = record
+        elif event.get("op") == "merge":
+            record = records.get(event.get("run_id"))
+            if record is not None:
+                record.update(event.get("fields") or {})
+    return list(records.values())
+
+def _parse(line):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return None
+
+def _migrate_legacy_history(job_id):
+    """
+    Converts a run_history_{job_id}.json file written by earlier versions into the
+    log, ahead of any events already appended there.
+    """
+    legacy_file = _legacy_history_file(job_id)
+    if not os.path.exists(legacy_file):
+        return
+    history_file = _history_file(job_id)
+    with FileLock(history_file + ".lock"):
+        if not os.path.exists(legacy_file):
+            return
+        with open(legacy_file, "r") as f:
+            try:
+                history = json.load(f)
+            except json.JSONDecodeError:
+                history = []
+        existing = b""
+        if os.path.exists(history_file):
+            with open(history_file, "rb") as f:
+                existing = f.read()
+        tmp_file = history_file + ".tmp"
+        with open(tmp_file, "wb") as f:
+            for record in history:
+                f.write(_event_line({"op": "put", "record": record}))
+            f.write(existing)
+        os.replace(tmp_file, history_file)
+        os.remove(legacy_file)
+
+def _refresh_index(job_id):
+    # Indexes events appended since the last call; starts over if the log was rewritten
+    with _indexes_lock:
+        index = _indexes.setdefault(job_id, _HistoryIndex())
+    with index.lock:
+        try:
+            st = os.stat(_history_file(job_id))
+        except FileNotFoundError:
+            index.reset(None)
+            return index
+        if st.st_ino != index.inode or st.st_size < index.size:
+            index.reset(st.st_ino)
+        if st.st_size > index.size:
+            with open(_history_file(job_id), "rb") as f:
+                f.seek(index.size)
+                offset = index.size
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # An append still in progress
+                    event = _parse(line)
+                    if event:
+                        index.add(event, offset)
+                    offset += len(line)
+                index.size = offset
+        return index
+
+def _append_event(job_id, event):
+    os.makedirs(RUN_HISTORY_DIR, exist_ok=True)
+    history_file = _history_file(job_id)
+    with FileLock(history_file + ".lock"):
+        if event.get("op") == "put":
+            # The index is read up to the end of the log under the lock, so it knows the last seq
+            event = {**event, "seq": _refresh_index(job_id).next_position}
+        with open(history_file, "ab") as f:
+            f.write(_event_line(event))
+        _update_latest_run(job_id, event)
 
 def load_run_history(job_id):
-    history_file = f"backend/data/run_history/run_history_{job_id}.json"
-    if os.path.exists(history_file):
-        with open(history_file, "r") as f:
-            return json.load(f)
-    return []
+    _migrate_legacy_history(job_id)
+    history_file = _history_file(job_id)
+    if not os.path.exists(history_file):
+        return []
+    with open(history_file, "rb") as f:
+        events = [_parse(line) for line in f if line.endswith(b"\n")]
+    return _fold(e for e in events if e)
+
+def _read_runs(job_id, inode, offsets_by_run):
+    # Folds the indexed events of each run; returns records in the given order, or None
+    # if the log was replaced since the offsets were taken from the index
+    records = []
+    try:
+        f = open(_history_file(job_id), "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        if os.fstat(f.fileno()).st_ino != inode:
+            return None
+        for offsets in offsets_by_run:
+            events = []
+            for offset in offsets:
+                f.seek(offset)
+                event = _parse(f.readline())
+                if event:
+                    events.append(event)
+            records.extend(_fold(events))
+    return records
+
+def get_run_record(job_id, run_id):
+    """
+    Returns one run record, reading only that run's events through the index, or None.
+    """
+    _migrate_legacy_history(job_id)
+    while True:
+        index = _refresh_index(job_id)
+        with index.lock:
+            inode = index.inode
+            offsets = list(index.offsets.get(run_id, []))
+        if not offsets:
+            return None
+        records = _read_runs(job_id, inode, [offsets])
+        if records is not None:
+            return records[0] if records else None
+
+def _project(record, fields=None, exclude=None):
+    if fields:
+        record = {k: v for k, v in record.items() if k in fields}
+    if exclude:
+        record = {k: v for k, v in record.items() if k not in exclude}
+    return record
+
+def _timestamp_bound(name, value, end_of_day=False):
+    # An ISO date or timestamp as the naive UTC isoformat timestamps are stored in;
+    # a date alone stands for the start of that day, or its end when end_of_day
+    text = value.strip()
+    if text[-1:] in ("Z", "z"):
+        text = text[:-1] + "+00:00"
+    try:
+        try:
+            moment = datetime.combine(date.fromisoformat(text), time.max if end_of_day else time.min)
+        except ValueError:
+            moment = datetime.fromisoformat(text)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date or timestamp, not '{value}'.")
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment.isoformat()
+
+def query_run_history(
+    job_id,
+    limit=None,
+    cursor=None,
+    newest_first=True,
+    status=None,
+    trigger_type=None,
+    scheduler_id=None,
+    since=None,
+    until=None,
+    fields=None,
+    exclude=None
+):
+    """
+    Returns (records, next_cursor) for one page of a job's run history.
+    Runs are matched against the index, so only the page's records are read.
+    limit: page size, or None for every matching run
+    cursor: next_cursor of the previous page; None starts from the newest (or oldest) run
+    status/trigger_type/scheduler_id: exact matches
+    since/until: ISO dates or timestamps, inclusive; naive ones are UTC, and a date alone as until covers that day
+    fields/exclude: keys to keep or drop from each record (e.g. exclude the file lists)
+    next_cursor is None on the last page. Raises ValueError if since or until does not parse.
+    """
+    since = _timestamp_bound("since", since) if since else None
+    until = _timestamp_bound("until", until, end_of_day=True) if until else None
+    _migrate_legacy_history(job_id)
+    filters = {"status": status, "trigger_type": trigger_type, "scheduler_id": scheduler_id}
+    records = None
+    while records is None:
+        index = _refresh_index(job_id)
+        with index.lock:
+            inode = index.inode
+            order = index.order
+            if newest_first:
+                end = bisect_left(order, int(cursor)) if cursor is not None else len(order)
+                positions = (order[i] for i in range(end - 1, -1, -1))
+            else:
+                start = bisect_right(order, int(cursor)) if cursor is not None else 0
+                positions = (order[i] for i in range(start, len(order)))
+            page = []
+            has_more = False
+            for position in positions:
+                run_id = index.run_at.get(position)
+                if run_id is None:
+                    continue  # The run was put again later
+                values = index.fields[run_id]
+                if any(v is not None and values.get(k) != v for k, v in filters.items()):
+                    continue
+                timestamp = values.get("timestamp") or ""
+                if (since and timestamp < since) or (until and timestamp > until):
+                    continue
+                if limit is not None and len(page) == limit:
+                    has_more = True  # Another matching run follows this page
+                    break
+                page.append((run_id, position, list(index.offsets[run_id])))
+        # A log replaced by compaction since the index was read is indexed again
+        records = _read_runs(job_id, inode, [offsets for _, _, offsets in page]) if page else []
+    next_cursor = str(page[-1][1]) if page and has_more else None
+    return [_project(r, fields, exclude) for r in records], next_cursor
+
+def _copied_files_count(record):
+    if "copied_files_count" in record:
+        return record["copied_files_count"]  # Details archived by compaction
+    if "date_runs" in record:
+        return sum(len(dr.get("copied_files", [])) for dr in record.get("date_runs", []))
+    return len(record.get("copied_files", []))
+
+def _duration_seconds(started_at, finished_at):
+    try:
+        return (datetime.fromisoformat(finished_at) - datetime.fromisoformat(started_at)).total_seconds()
+    except (TypeError, ValueError):
+        return None
+
+def _summarise(record, previous=None):
+    # A run's "executing" write marks when it started (it may follow a "queued" write
+    # of the same run); without it the duration is unknown
+    same_run = previous is not None and previous.get("run_id") == record.get("run_id")
+    if record.get("status") == "executing":
+        started_at = record.get("timestamp")
+    elif same_run:
+        started_at = previous.get("started_at")
+    else:
+        started_at = None
+    return {
+        "run_id": record.get("run_id"),
+        "status": record.get("status"),
+        "message": record.get("message"),
+        "copied_files_count": _copied_files_count(record),
+        "timestamp": record.get("timestamp"),
+        "started_at": started_at,
+        "duration_seconds": None if record.get("status") == "executing" else _duration_seconds(started_at, record.get("timestamp")),
+    }
+
+def _update_latest_run(job_id, event):
+    # Caller holds the job's log FileLock; applies a put or a merge to the job's summary
+    summary_file = _latest_run_file(job_id)
+    previous = load_json(summary_file)
+    if event.get("op") == "put":
+        summary = _summarise(event.get("record") or {}, previous)
+    elif previous is not None and previous.get("run_id") == event.get("run_id"):
+        fields = event.get("fields") or {}
+        # New file lists replace the count the summary took from the earlier ones
+        kept = {k: v for k, v in previous.items() if k != "copied_files_count" or not any(f in fields for f in DETAIL_FIELDS)}
+        summary = _summarise({**kept, **fields}, previous)
+    else:
+        return
+    save_json(summary_file, summary)
+
+def _rebuild_latest_run(job_id):
+    # Summarises the history of a job whose log predates the summary files, once
+    _migrate_legacy_history(job_id)
+    history_file = _history_file(job_id)
+    if not os.path.exists(history_file):
+        return None
+    with FileLock(history_file + ".lock"):
+        summary = load_json(_latest_run_file(job_id))
+        if summary is None:
+            history = load_run_history(job_id)
+            if history:
+                summary = _summarise(history[-1])
+                save_json(_latest_run_file(job_id), summary)
+    return summary
+
+def load_latest_runs(job_ids):
+    """
+    Returns {job_id: summary of its latest run, or None} without reading any run history,
+    except once for jobs whose history predates the summary files.
+    """
+    result = {}
+    for job_id in job_ids:
+        summary = load_json(_latest_run_file(job_id))
+        if summary is None and (os.path.exists(_history_file(job_id)) or os.path.exists(_legacy_history_file(job_id))):
+            summary = _rebuild_latest_run(job_id)
+        result[job_id] = summary
+    return result
+
+def delete_latest_run(job_id):
+    """
+    Removes the latest-run summary of a deleted job; its run history is kept.
+    """
+    summary_file = _latest_run_file(job_id)
+    with FileLock(_history_file(job_id) + ".lock"):
+        try:
+            os.remove(summary_file)
+        except FileNotFoundError:
+            pass
+    invalidate_json(summary_file)
+
+def _write_log(history_file, history, positions=None):
+    # Caller holds the log's FileLock. Each put keeps its run's seq from positions, if given
+    tmp_file = history_file + ".tmp"
+    with open(tmp_file, "wb") as f:
+        for i, record in enumerate(history):
+            seq = positions[record.get("run_id")] if positions else i
+            f.write(_event_line({"op": "put", "seq": seq, "record": record}))
+    os.replace(tmp_file, history_file)
 
 def save_run_history(job_id, history):
-    with FileLock(f"backend/data/run_history/run_history_{job_id}.json.lock"):
-        history_file = f"backend/data/run_history/run_history_{job_id}.json"
-        with open(history_file, "w") as f:
-            json.dump(history, f, indent=2)
+    """
+    Replaces a job's whole history, rewriting the log with one event per record.
+    """
+    os.makedirs(RUN_HISTORY_DIR, exist_ok=True)
+    history_file = _history_file(job_id)
+    with FileLock(history_file + ".lock"):
+        _write_log(history_file, history)
 
 def write_run_status(
     job_id,
@@ -26,15 +413,14 @@ def write_run_status(
     file_mask_used="",
     source_files=None,
     copied_files=None,
-    extra_details=None
+    extra_details=None,
+    skipped_count=0
 ):
     """
-    Write or update a run record with the given run_id and status to the run history file.
+    Write or update a run record with the given run_id and status to the run history log.
     If a record with the same run_id exists, it will be replaced (overridden).
+    skipped_count: number of files an incremental copy left alone because they were unchanged.
     """
-    history = load_run_history(job_id)
-    # Remove any existing entry with the same run_id
-    history = [h for h in history if h.get("run_id") != run_id]
     run_record = {
         "run_id": run_id,
         "timestamp": datetime.utcnow().isoformat(),
@@ -43,14 +429,14 @@ def write_run_status(
         "file_mask_used": file_mask_used or "",
         "source_files": source_files if source_files is not None else [],
         "copied_files": copied_files if copied_files is not None else [],
+        "skipped_count": skipped_count or 0,
         "trigger_type": trigger_type
     }
     if scheduler_id is not None:
         run_record["scheduler_id"] = scheduler_id
     if extra_details and isinstance(extra_details, dict):
         run_record.update(extra_details)
-    history.append(run_record)
-    save_run_history(job_id, history)
+    _append_event(job_id, {"op": "put", "record": run_record})
 
 def update_run_status(
     job_id,
@@ -65,24 +451,184 @@ def update_run_status(
     extra_details=None
 ):
     """
-    Update the run record with the given run_id in the run history file.
+    Update the run record with the given run_id in the run history log.
     extra_details: dict, any additional info to log (e.g., time_travel_date, error_detail, etc.)
     """
-    history = load_run_history(job_id)
-    for record in history:
-        if record.get("run_id") == run_id:
-            record.update({
-                "timestamp": datetime.utcnow().isoformat(),
-                "status": status,
-                "message": message,
-                "file_mask_used": file_mask,
-                "source_files": source_files,
-                "copied_files": copied_files,
-                "trigger_type": trigger_type
-            })
-            if scheduler_id is not None:
-                record["scheduler_id"] = scheduler_id
-            if extra_details and isinstance(extra_details, dict):
-                record.update(extra_details)
-            break
-    save_run_history(job_id, history)
\ No newline at end of file
+    fields = {
+        "timestamp": datetime.utcnow().isoformat(),
+        "status": status,
+        "message": message,
+        "file_mask_used": file_mask,
+        "source_files": source_files,
+        "copied_files": copied_files,
+        "trigger_type": trigger_type
+    }
+    if scheduler_id is not None:
+        fields["scheduler_id"] = scheduler_id
+    if extra_details and isinstance(extra_details, dict):
+        fields.update(extra_details)
+    _append_event(job_id, {"op": "merge", "run_id": run_id, "fields": fields})
+
+# Retention and compaction. A compaction pass folds the log to one put per run,
+# moves runs past the job's retention to a gzipped archive segment, and moves the
+# file lists of older runs there too, leaving their counts in the log. Daily rollups
+# (runs, failures, files, bytes) cover archived runs as well as the ones still kept.
+
+# Fields of a run record moved to the archive once the run is older than detail_days
+DETAIL_FIELDS = ("source_files", "copied_files", "date_runs")
+
+def _archive_dir(job_id):
+    return os.path.join(RUN_ARCHIVE_DIR, str(job_id))
+
+def _rollups_file(job_id):
+    return os.path.join(RUN_HISTORY_DIR, f"rollups_{job_id}.json")
+
+def _bytes_copied(record):
+    if "bytes_copied" in record:
+        return record.get("bytes_copied") or 0
+    return sum(dr.get("bytes_copied", 0) or 0 for dr in record.get("date_runs", []))
+
+def _source_files_count(record):
+    if "source_files_count" in record:
+        return record["source_files_count"]
+    if record.get("date_runs"):
+        return sum(len(dr.get("source_files", [])) for dr in record["date_runs"])
+    return len(record.get("source_files", []))
+
+def _without_details(record, segment):
+    slim = {k: v for k, v in record.items() if k not in DETAIL_FIELDS}
+    slim["copied_files_count"] = _copied_files_count(record)
+    slim["source_files_count"] = _source_files_count(record)
+    slim["bytes_copied"] = _bytes_copied(record)
+    slim["details_archived"] = segment
+    return slim
+
+def _write_archive_segment(job_id, segment, expired, detailed, archived_at):
+    os.makedirs(_archive_dir(job_id), exist_ok=True)
+    path = os.path.join(_archive_dir(job_id), segment)
+    with gzip.open(path + ".tmp", "wb") as f:
+        for record in expired:
+            f.write(_event_line({"run_id": record.get("run_id"), "archived_at": archived_at, "expired": True, "record": record}))
+        for record in detailed:
+            f.write(_event_line({"run_id": record.get("run_id"), "archived_at": archived_at, "expired": False, "record": record}))
+    os.replace(path + ".tmp", path)
+
+def _add_to_rollup(days, record):
+    # Finished runs count towards the day they finished on
+    day = (record.get("timestamp") or "")[:10]
+    if not day or record.get("status") == "executing":
+        return
+    rollup = days.setdefault(day, {"runs": 0, "failures": 0, "files": 0, "bytes": 0})
+    rollup["runs"] += 1
+    rollup["failures"] += 1 if record.get("status") == "Failed" else 0
+    rollup["files"] += _copied_files_count(record)
+    rollup["bytes"] += _bytes_copied(record)
+
+def _update_rollups(job_id, kept, expired):
+    rollups = load_json(_rollups_file(job_id), default={})
+    archived = rollups.get("archived", {})
+    for record in expired:
+        _add_to_rollup(archived, record)
+    days = {day: dict(rollup) for day, rollup in archived.items()}
+    for record in kept:
+        _add_to_rollup(days, record)
+    save_json(_rollups_file(job_id), {
+        "archived": archived,
+        "days": dict(sorted(days.items())),
+        "updated_at": datetime.utcnow().isoformat(),
+    })
+
+def compact_run_history(job_id, keep_runs=None, keep_days=None, detail_days=None, now=None):
+    """
+    Applies retention to a job's run history and refreshes its daily rollups.
+    keep_runs: runs kept in the log; older runs are archived (None keeps all)
+    keep_days: runs that finished more than this many days ago are archived (None keeps all)
+    detail_days: finished runs older than this keep their counts in the log, their file lists go to the archive
+    The newest run is always kept. Returns counts of what was done, or None if the job has no history.
+    """
+    _migrate_legacy_history(job_id)
+    history_file = _history_file(job_id)
+    if not os.path.exists(history_file):
+        return None
+    now = now or datetime.utcnow()
+    keep_after = (now - timedelta(days=keep_days)).isoformat() if keep_days is not None else None
+    detail_after = (now - timedelta(days=detail_days)).isoformat() if detail_days is not None else None
+    segment = f"{now.strftime('%Y%m%dT%H%M%S%f')}-{uuid.uuid4().hex[:8]}.jsonl.gz"
+    with FileLock(history_file + ".lock"):
+        with open(history_file, "rb") as f:
+            events = [e for e in (_parse(line) for line in f if line.endswith(b"\n")) if e]
+        records = _fold(events)
+        # The seq of each run's last put, which the rewritten log keeps
+        sequence = _HistoryIndex()
+        for event in events:
+            sequence.add(event, 0)
+        kept, expired, detailed = [], [], []
+        for i, record in enumerate(records):
+            timestamp = record.get("timestamp") or ""
+            newest = i == len(records) - 1
+            too_many = keep_runs is not None and i < len(records) - max(keep_runs, 1)
+            too_old = keep_after is not None and timestamp < keep_after
+            if not newest and (too_many or too_old):
+                expired.append(record)
+            elif (detail_after is not None and timestamp < detail_after and record.get("status") != "executing"
+                    and any(field in record for field in DETAIL_FIELDS)):
+                detailed.append(record)
+                kept.append(_without_details(record, segment))
+            else:
+                kept.append(record)
+        # The archive is written before the log loses anything; a pass interrupted
+        # after that leaves duplicates in the archive, never gaps
+        if expired or detailed:
+            _write_archive_segment(job_id, segment, expired, detailed, now.isoformat())
+        if expired or detailed or len(events) != len(records):
+            _write_log(history_file, kept, sequence.positions)
+        _update_rollups(job_id, kept, expired)
+    return {
+        "events": len(events),
+        "runs": len(kept),
+        "archived_runs": len(expired),
+        "archived_details": len(detailed),
+    }
+
+def load_run_rollups(job_id):
+    """
+    Returns a job's daily rollups as of the last compaction:
+    {"YYYY-MM-DD": {"runs", "failures", "files", "bytes"}}, oldest day first.
+    """
+    return load_json(_rollups_file(job_id), default={}).get("days", {})
+
+def _find_archived(job_id, segment, run_id):
+    path = os.path.join(_archive_dir(job_id), segment)
+    if not os.path.exists(path):
+        return None
+    with gzip.open(path, "rb") as f:
+        for line in f:
+            entry = _parse(line)
+            if entry and entry.get("run_id") == run_id:
+                return entry.get("record")
+    return None
+
+def load_archived_run(job_id, run_id):
+    """
+    Returns the full record of an archived run, or None if it is not in the archive.
+    """
+    archive_dir = _archive_dir(job_id)
+    if not os.path.isdir(archive_dir):
+        return None
+    for segment in sorted(os.listdir(archive_dir), reverse=True):
+        if segment.endswith(".jsonl.gz"):
+            record = _find_archived(job_id, segment, run_id)
+            if record is not None:
+                return restore_run_details(job_id, record)
+    return None
+
+def restore_run_details(job_id, record):
+    """
+    Returns record with the file lists compaction moved to the archive put back.
+    """
+    segment = record.get("details_archived")
+    if not segment:
+        return record
+    archived = _find_archived(job_id, segment, record.get("run_id")) or {}
+    details = {field: archived[field] for field in DETAIL_FIELDS if field in archived}
+    return {**record, **details}
@@ -0,0 +1,18 @@
+from backend.storage.document_store import get_collection
+
+SCHEDULE_FILE = "backend/data/schedules.json"
+
+def _schedules():
+    return get_collection("schedules", SCHEDULE_FILE)
+
+def load_schedules():
+    return _schedules().load()
+
+def save_schedules(schedules):
+    _schedules().save(schedules)
+
+def load_schedule_by_id(schedule_id):
+    """
+    Returns the schedule with the given id, or None.
+    """
+    return _schedules().get("id", schedule_id)
@@ -0,0 +1,22 @@
+import os
+import json
+from filelock import FileLock
+
+MANIFEST_DIR = "backend/data/manifests"
+
+def load_manifest(job_id):
+    manifest_file = os.path.join(MANIFEST_DIR, f"manifest_{job_id}.json")
+    if os.path.exists(manifest_file):
+        with open(manifest_file, "r") as f:
+            try:
+                return json.load(f)
+            except json.JSONDecodeError:
+                return {}
+    return {}
+
+def save_manifest(job_id, manifest):
+    os.makedirs(MANIFEST_DIR, exist_ok=True)
+    manifest_file = os.path.join(MANIFEST_DIR, f"manifest_{job_id}.json")
+    with FileLock(manifest_file + ".lock"):
+        with open(manifest_file, "w") as f:
+            json.dump(manifest, f)
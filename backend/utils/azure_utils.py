@@ -1,16 +1,70 @@
 from azure.storage.filedatalake import DataLakeServiceClient
+from azure.storage.blob import BlobServiceClient, BlobSasPermissions, generate_blob_sas
 from azure.core.exceptions import AzureError
+from datetime import datetime, timedelta
+from backend.config.settings import ADLS_CLIENT_TTL_SECONDS, ADLS_CLIENT_CACHE_SIZE
 import concurrent.futures
+import hashlib
 import socket
+import threading
+import time
 
-def get_adl_service_client(account_name, account_key, timeout=10):
+# Process-wide registry of service clients, keyed by (kind, account name, key fingerprint).
+# Reusing a client keeps its HTTP connection pool warm and means credentials are validated once.
+_client_cache = {}
+_client_cache_lock = threading.Lock()
+# Shared executor used to enforce the authentication timeout without creating a pool per call
+_auth_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="adls-auth")
+
+def _key_fingerprint(account_key):
+    return hashlib.sha256((account_key or "").encode()).hexdigest()
+
+def _get_cached_client(cache_key):
+    with _client_cache_lock:
+        entry = _client_cache.get(cache_key)
+        if not entry:
+            return None
+        if time.monotonic() - entry["created"] > ADLS_CLIENT_TTL_SECONDS:
+            del _client_cache[cache_key]
+            return None
+        entry["last_used"] = time.monotonic()
+        return entry["client"]
+
+def _store_client(cache_key, client):
+    now = time.monotonic()
+    with _client_cache_lock:
+        _client_cache[cache_key] = {"client": client, "created": now, "last_used": now}
+        # Evict least recently used clients beyond the cache size
+        while len(_client_cache) > ADLS_CLIENT_CACHE_SIZE:
+            oldest = min(_client_cache, key=lambda k: _client_cache[k]["last_used"])
+            del _client_cache[oldest]
+
+def invalidate_azure_clients(account_name=None):
+    """
+    Drops cached clients for account_name, or every cached client if account_name is None.
+    Called when a data source's credentials change.
+    """
+    with _client_cache_lock:
+        for cache_key in list(_client_cache):
+            if account_name is None or cache_key[1] == account_name:
+                del _client_cache[cache_key]
+
+def get_adl_service_client(account_name, account_key, timeout=10, use_cache=True):
     """
     Returns an authenticated DataLakeServiceClient for the given account.
     Tries to connect and raises an exception if authentication fails or if it times out.
+    Clients are cached per account for ADLS_CLIENT_TTL_SECONDS, so only the first call validates credentials.
     :param account_name: Azure storage account name
     :param account_key: Azure storage account key
     :param timeout: Timeout in seconds for authentication
+    :param use_cache: Set to False to always build and validate a fresh client
     """
+    cache_key = ("datalake", account_name, _key_fingerprint(account_key))
+    if use_cache:
+        client = _get_cached_client(cache_key)
+        if client:
+            return client
+
     def connect():
         # Attempt to create the client and list file systems to force authentication
         client = DataLakeServiceClient(
@@ -18,19 +72,20 @@ def get_adl_service_client(account_name, account_key, timeout=10):
             credential=account_key
         )
         # This call will fail fast if the account does not exist or credentials are invalid
-        list(client.list_file_systems())
+        next(iter(client.list_file_systems(results_per_page=1)), None)
         return client
 
     try:
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = executor.submit(connect)
-            return future.result(timeout=timeout)
+        client = _auth_executor.submit(connect).result(timeout=timeout)
     except concurrent.futures.TimeoutError:
         raise Exception(f"Azure authentication timed out after {timeout} seconds")
     except AzureError as ae:
         raise Exception(f"Azure authentication failed: {ae}")
     except Exception as e:
         raise Exception(f"Azure connection error: {e}")
+    if use_cache:
+        _store_client(cache_key, client)
+    return client
     
 def test_adls_connection(account_name, account_key, container=None, timeout=10):
     """
@@ -40,7 +95,7 @@ def test_adls_connection(account_name, account_key, container=None, timeout=10):
     Returns (success: bool, message: str)
     """
     try:
-        client = get_adl_service_client(account_name, account_key, timeout=timeout)
+        client = get_adl_service_client(account_name, account_key, timeout=timeout, use_cache=False)
         if container:
             fs_client = client.get_file_system_client(container)
             # Try listing paths to verify access to the container
@@ -54,4 +109,33 @@ def test_adls_connection(account_name, account_key, container=None, timeout=10):
     except AzureError as ae:
         return False, f"Azure error: {ae}"
     except Exception as e:
-        return False, f"Connection failed: {e}"
\ No newline at end of file
+        return False, f"Connection failed: {e}"
+
+def get_blob_service_client(account_name, account_key):
+    """
+    Returns a BlobServiceClient for the given account.
+    Used for blob-level operations such as server-side copy that the Data Lake client does not expose.
+    Shares the client registry (and its TTL) with get_adl_service_client.
+    """
+    cache_key = ("blob", account_name, _key_fingerprint(account_key))
+    client = _get_cached_client(cache_key)
+    if not client:
+        client = BlobServiceClient(
+            account_url=f"https://{account_name}.blob.core.windows.net",
+            credential=account_key
+        )
+        _store_client(cache_key, client)
+    return client
+
+def generate_read_sas(account_name, account_key, filesystem, path, ttl_minutes):
+    """
+    Returns a read-only SAS token for a single file, valid for ttl_minutes.
+    """
+    return generate_blob_sas(
+        account_name=account_name,
+        container_name=filesystem,
+        blob_name=path,
+        account_key=account_key,
+        permission=BlobSasPermissions(read=True),
+        expiry=datetime.utcnow() + timedelta(minutes=ttl_minutes)
+    )
@@ -0,0 +1,123 @@
+import threading
+from bisect import bisect_left
+from datetime import date, timedelta
+import holidays
+from backend.config.settings import DEFAULT_HOLIDAY_CALENDAR
+
+# Business days of a year are precomputed once into a sorted table of date ordinals,
+# with the index of each month's first business day; "nth business day of a period"
+# is then an index into the table, and is_business_day a binary search.
+
+
+class _YearTable:
+    def __init__(self, year, holiday_set):
+        first = date(year, 1, 1).toordinal()
+        last = date(year, 12, 31).toordinal()
+        self.days = [
+            ordinal for ordinal in range(first, last + 1)
+            if ordinal % 7 not in (0, 6) and date.fromordinal(ordinal) not in holiday_set  # Sunday, Saturday
+        ]
+        # month_starts[m] is the index of the first business day on or after month m + 1 starts
+        self.month_starts = [bisect_left(self.days, date(year, m, 1).toordinal()) for m in range(1, 13)]
+        self.month_starts.append(len(self.days))
+
+
+class BusinessCalendar:
+    """
+    Weekdays that are not holidays. holidays_for(year) returns the holidays of a
+    year as a container of dates; each year's table is built on first use.
+    """
+    def __init__(self, holidays_for):
+        self._holidays_for = holidays_for
+        self._years = {}
+        self._lock = threading.Lock()
+
+    def _year(self, year):
+        table = self._years.get(year)
+        if table is None:
+            with self._lock:
+                table = self._years.get(year)
+                if table is None:
+                    table = self._years[year] = _YearTable(year, self._holidays_for(year))
+        return table
+
+    def is_business_day(self, day):
+        table = self._year(day.year)
+        ordinal = day.toordinal()
+        i = bisect_left(table.days, ordinal)
+        return i < len(table.days) and table.days[i] == ordinal
+
+    def business_days_in(self, year, first_month, months):
+        """
+        Number of business days in the months first_month .. first_month + months - 1 of year.
+        """
+        table = self._year(year)
+        return table.month_starts[first_month - 1 + months] - table.month_starts[first_month - 1]
+
+    def nth_business_day(self, year, first_month, months, n):
+        """
+        The nth (1-based) business day of a period of whole months within one
+        year, or None if the period has fewer than n business days or does not
+        lie within the year.
+        """
+        if first_month < 1 or first_month + months - 1 > 12:
+            return None
+        table = self._year(year)
+        start = table.month_starts[first_month - 1]
+        end = table.month_starts[first_month - 1 + months]
+        if 0 < n <= end - start:
+            return date.fromordinal(table.days[start + n - 1])
+        return None
+
+
+def nth_day(year, first_month, months, n):
+    """
+    The nth (1-based) calendar day of a period of whole months within one year, or None
+    if the period has fewer than n days or does not lie within the year.
+    """
+    if first_month < 1 or first_month + months - 1 > 12:
+        return None
+    start = date(year, first_month, 1)
+    end = date(year + 1, 1, 1) if first_month + months > 12 else date(year, first_month + months, 1)
+    day = start + timedelta(days=n - 1) if n > 0 else None
+    return day if day is not None and day < end else None
+
+
+# Calendars by name, created on first use and kept for the life of the process:
+#   "GB-England", "US-NY", "DE": a country, optionally with one of its subdivisions
+#   "ECB", "NYSE", ...:         a financial market
+# Holiday years are loaded by the holidays package when a year's table is first built.
+_calendars = {}
+_calendars_lock = threading.Lock()
+
+def _holidays_for_name(name):
+    if name in holidays.list_supported_financial():
+        return holidays.financial_holidays(name)
+    country, _, subdiv = name.partition("-")
+    return holidays.country_holidays(country, subdiv=subdiv or None)
+
+def get_calendar(name=None):
+    """
+    Returns the business calendar called name (DEFAULT_HOLIDAY_CALENDAR if None).
+    Raises ValueError for a country, subdivision or market the holidays package does not know.
+    """
+    name = name or DEFAULT_HOLIDAY_CALENDAR
+    with _calendars_lock:
+        calendar = _calendars.get(name)
+        if calendar is None:
+            try:
+                # Populates nothing yet; each year is added on first lookup
+                holiday_set = _holidays_for_name(name)
+            except NotImplementedError as e:
+                raise ValueError(f"Unknown holiday calendar '{name}': {e}")
+            calendar = _calendars[name] = BusinessCalendar(lambda year: holiday_set)
+        return calendar
+
+def supported_calendars():
+    """
+    Names accepted by get_calendar: {"countries": {code: [subdivisions]}, "financial": [markets]}.
+    """
+    return {
+        "countries": holidays.list_supported_countries(),
+        "financial": sorted(holidays.list_supported_financial()),
+    }
@@ -0,0 +1,98 @@
+import errno
+import os
+import shutil
+
+# ioctl request number for FICLONE (Linux), which shares the source extents with the
+# destination on reflink-capable filesystems (btrfs, XFS, bcachefs, ...).
+FICLONE = 0x40049409
+# Largest count passed to a single copy_file_range/sendfile call
+_MAX_CHUNK = 1024 * 1024 * 1024
+# errnos meaning "this method is not available here", after which the next method is tried
+_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF, errno.ETXTBSY}
+
+
+def _reflink(src_fd, dst_fd):
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        fcntl.ioctl(dst_fd, FICLONE, src_fd)
+        return True
+    except OSError as e:
+        if e.errno in _UNSUPPORTED or e.errno == errno.ENOTTY:
+            return False
+        raise
+
+
+def _copy_file_range(src_fd, dst_fd, offset, size):
+    while offset < size:
+        copied = os.copy_file_range(src_fd, dst_fd, min(size - offset, _MAX_CHUNK), offset, offset)
+        if copied == 0:
+            break
+        offset += copied
+    return offset
+
+
+def _sendfile(src_fd, dst_fd, offset, size):
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    while offset < size:
+        sent = os.sendfile(dst_fd, src_fd, offset, min(size - offset, _MAX_CHUNK))
+        if sent == 0:
+            break
+        offset += sent
+    return offset
+
+
+def fast_copy_file(src, dst):
+    """
+    Copies src to dst with data, permission bits and timestamps, like shutil.copy2,
+    but lets the kernel move the data where it can: reflink (FICLONE) first, then
+    os.copy_file_range, then os.sendfile, falling back to a buffered copy.
+    Returns the name of the method that copied the data.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    size = os.path.getsize(src)
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+        method, offset = None, 0
+        if size and _reflink(src_fd, dst_fd):
+            method, offset = "reflink", size
+        for name, copier, available in (("copy_file_range", _copy_file_range, hasattr(os, "copy_file_range")),
+                                        ("sendfile", _sendfile, hasattr(os, "sendfile"))):
+            if method or not available:
+                continue
+            try:
+                offset = copier(src_fd, dst_fd, offset, size)
+                if offset >= size:
+                    method = name
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED:
+                    raise
+        if not method:
+            fsrc.seek(offset)
+            fdst.seek(offset)
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+            method = "buffered"
+    shutil.copystat(src, dst)
+    return method
+
+
+def move_file(src, dst):
+    """
+    Moves src to dst. On the same filesystem this is a single O(1) rename;
+    across filesystems the file is copied with fast_copy_file and the source removed.
+    Returns "rename" or the copy method used.
+    """
+    if os.path.isdir(dst):
+        dst = os.path.join(dst, os.path.basename(src))
+    try:
+        os.replace(src, dst)
+        return "rename"
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    method = fast_copy_file(src, dst)
+    os.remove(src)
+    return method
@@ -0,0 +1,35 @@
+import os
+import fnmatch
+from collections import namedtuple
+
+# path: full path, relative_path: path below the walk root, entry: the os.DirEntry it came from
+WalkedFile = namedtuple("WalkedFile", ["path", "relative_path", "entry"])
+
+
+def walk_files(root, file_mask="*", recursive=False, max_depth=None, exclude_dirs=None):
+    """
+    Lazily yields a WalkedFile for every file under root whose name matches file_mask.
+    Uses os.scandir so file type checks come from the directory listing itself
+    (one readdir per directory, no extra stat per entry on most platforms).
+    recursive: descend into subdirectories
+    max_depth: how many levels below root to descend (None for unlimited)
+    exclude_dirs: fnmatch patterns; matching subdirectory names are not entered
+    """
+    exclude_dirs = exclude_dirs or []
+    stack = [(root, "", 0)]
+    while stack:
+        directory, relative_dir, depth = stack.pop()
+        subdirs = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    if fnmatch.fnmatch(entry.name, file_mask):
+                        yield WalkedFile(entry.path, os.path.join(relative_dir, entry.name), entry)
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    if max_depth is not None and depth >= max_depth:
+                        continue
+                    if any(fnmatch.fnmatch(entry.name, pattern) for pattern in exclude_dirs):
+                        continue
+                    subdirs.append((entry.path, os.path.join(relative_dir, entry.name), depth + 1))
+        # Reverse so subdirectories are visited in listing order
+        stack.extend(reversed(subdirs))
@@ -12,15 +12,15 @@ class MockDateTime(datetime.datetime):
         return cls._mock_now.replace(tzinfo=tz)
 
 def get_mocked_datetime_env(fake_date: datetime.date):
-    # Set the mock date/time
-    MockDate._mock_today = fake_date
-    MockDateTime._mock_now = datetime.datetime.combine(fake_date, datetime.time())
+    # Mock classes of their own for each call, so concurrent runs for different dates don't share the mock date/time
+    run_date = datetime.datetime.combine(fake_date, datetime.time())
+    mock_date = type("MockDate", (MockDate,), {"_mock_today": fake_date})
+    mock_datetime = type("MockDateTime", (MockDateTime,), {"_mock_now": run_date})
     # Provide these mocks in the exec environment
-    run_date = MockDateTime._mock_now
     return {
         "datetime": datetime,
-        "date": MockDate,
-        "datetime_class": MockDateTime,
+        "date": mock_date,
+        "datetime_class": mock_datetime,
         "run_date": run_date,
     }
     
@@ -26,6 +26,8 @@ function JobRunHistory() {
   const [expandedDateRun, setExpandedDateRun] = useState(null);
   const [jobName, setJobName] = useState("");
   const [schedulers, setSchedulers] = useState([]);
+  // Full records of runs whose file lists were moved to the archive, by run_id
+  const [archivedDetails, setArchivedDetails] = useState({});
 
   // Fetch schedulers for mapping ID to name
   const fetchSchedulers = async () => {
@@ -42,6 +44,17 @@ function JobRunHistory() {
     setRunHistory(res.data || []);
   };
 
+  // Older runs keep only counts in the history; their details are fetched when shown
+  const fetchArchivedDetails = async (run) => {
+    if (!run.details_archived || archivedDetails[run.run_id]) return;
+    try {
+      const res = await axios.get(`/jobs/${id}/run-history/${run.run_id}`);
+      setArchivedDetails((prev) => ({ ...prev, [run.run_id]: res.data }));
+    } catch {
+      setArchivedDetails((prev) => ({ ...prev, [run.run_id]: null }));
+    }
+  };
+
   const fetchJobName = async () => {
     const res = await axios.get("/jobs");
     const job = res.data.find((j) => String(j.id) === String(id));
@@ -78,6 +91,7 @@ function JobRunHistory() {
     if (isPolling && runHistory.length > 0) {
       const running = runHistory.find(
         (r) =>
+          r.status === "queued" ||
           r.status === "executing" ||
           r.status === "Running..." ||
           r.status === "In Progress"
@@ -152,7 +166,9 @@ function JobRunHistory() {
             )}
             {[...runHistory]
               .sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp))
-              .map((run, idx) => (
+              .map((listedRun, idx) => {
+                const run = archivedDetails[listedRun.run_id] || listedRun;
+                return (
                 <React.Fragment key={idx}>
                   <TableRow>
                     <TableCell>{idx + 1}</TableCell>
@@ -189,9 +205,10 @@ function JobRunHistory() {
                       <Button
                         size="small"
                         variant="outlined"
-                        onClick={() =>
-                          setExpanded(expanded === idx ? null : idx)
-                        }
+                        onClick={() => {
+                          if (expanded !== idx) fetchArchivedDetails(run);
+                          setExpanded(expanded === idx ? null : idx);
+                        }}
                       >
                         {expanded === idx ? "Hide" : "Show"}
                       </Button>
@@ -205,6 +222,15 @@ function JobRunHistory() {
                         unmountOnExit
                       >
                         <Box sx={{ p: 2 }}>
+                          {run.details_archived && !archivedDetails[run.run_id] && (
+                            <Alert severity="info" sx={{ mb: 2 }}>
+                              {archivedDetails[run.run_id] === null
+                                ? "The file details of this run are archived and could not be loaded."
+                                : "Loading archived file details..."}{" "}
+                              Copied {run.copied_files_count} of{" "}
+                              {run.source_files_count} matching files.
+                            </Alert>
+                          )}
                           {Array.isArray(run.date_runs) &&
                           run.date_runs.length > 1 ? (
                             (() => {
@@ -388,7 +414,8 @@ function JobRunHistory() {
                     </TableCell>
                   </TableRow>
                 </React.Fragment>
-              ))}
+                );
+              })}
           </TableBody>
         </Table>
       </TableContainer>